@@ -8,36 +8,45 @@ from config import (
     GENERATED_TESTCASES_FILE,
     VALIDATION_REPORT_FILE,
     MAX_FEEDBACK_RETRIES,
-    COMPLETENESS_THRESHOLD
+    COMPLETENESS_THRESHOLD,
+    SSD_DOCX_FILE,
+    INCREMENTAL_VALIDATION
 )
 
-from data_processing.raw_extraction import extract_docx_sections
-from data_processing.data_classification import aggregate_important_requirements
-from validator.validator import validate_testcases
+from data_processing.ssd_cache import process_ssd
+from validator.validator import (
+    validate_testcases,
+    validate_incremental,
+    incremental_supported,
+    load_testcases,
+)
 from generator.generator import run_generator
+from testcase_store import TestcaseStore, testcase_store_file
 
 
 def main():
     print("Starting Integrated AI Testcase System Orchestrator...")
 
   
-    #  Extract SSD from DOCX
-    if not PROCESSED_SSD_FILE.exists() or PROCESSED_SSD_FILE.stat().st_size == 0:
-        print("Extracting SSD document...")
-        # ssd_docx_path = PROCESSED_SSD_FILE
-        ssd_docx_path = Path("data/input/ssd.docx")
-        raw_ssd_data = extract_docx_sections(ssd_docx_path)
-
-        print("Classifying important requirements...")
-        classified_data = aggregate_important_requirements(raw_ssd_data)
+    #  Extract + classify SSD (cached by DOCX content hash)
+    _, classified_data, _ = process_ssd(SSD_DOCX_FILE)
+
+    # A cache hit can still differ from the file (e.g. another SSD was
+    # processed since), so compare contents rather than trusting the hit
+    try:
+        ssd_output_stale = (
+            json.loads(PROCESSED_SSD_FILE.read_text(encoding="utf-8")) != classified_data
+        )
+    except (OSError, json.JSONDecodeError):
+        ssd_output_stale = True
 
+    if ssd_output_stale:
         PROCESSED_SSD_FILE.parent.mkdir(parents=True, exist_ok=True)
         with PROCESSED_SSD_FILE.open("w", encoding="utf-8") as f:
             json.dump(classified_data, f, indent=2, ensure_ascii=False)
 
         print(f"SSD processed and saved to {PROCESSED_SSD_FILE}")
 
- 
     # print("Extracting SSD document...")
     # ssd_docx_path = Path("data/input/ssd.docx")
     # raw_ssd_data = extract_docx_sections(ssd_docx_path)
@@ -55,37 +64,64 @@ def main():
     # print(f"SSD processed and saved to {PROCESSED_SSD_FILE}")
 
  
-    # 3) Initial Testcase Generation (ONLY ONCE)
+    # 3) Testcase Generation (initial run, or only sections whose requirements changed)
   
     GENERATED_TESTCASES_FILE.parent.mkdir(parents=True, exist_ok=True)
 
     if not GENERATED_TESTCASES_FILE.exists() or GENERATED_TESTCASES_FILE.stat().st_size == 0:
         print("No existing testcases found. Generating initial testcases...")
+    else:
+        print("Checking requirement sections for changes...")
 
-        run_generator(
-            master_requirement_file=PROCESSED_SSD_FILE,
-            new_requirement_file=None,  
-            output_testcase_file=GENERATED_TESTCASES_FILE,
-            hash_file=Path("data/output/requirements.hash"),
-        )
+    run_generator(
+        master_requirement_file=PROCESSED_SSD_FILE,
+        new_requirement_file=None,  
+        output_testcase_file=GENERATED_TESTCASES_FILE,
+        hash_file=Path("data/output/requirements.hash"),
+    )
 
 
     # 4) Validation + Feedback Loop
 
+    store = TestcaseStore(testcase_store_file(GENERATED_TESTCASES_FILE))
+
+    # Feedback iterations must score like the first attempt
+    incremental = INCREMENTAL_VALIDATION and incremental_supported()
+    if INCREMENTAL_VALIDATION and not incremental:
+        print("Incremental validation is off: the validator service, coverage-only, "
+              "cascade or BM25 mode is enabled.")
+
     feedback_attempt = 0
     completeness = 0
     accuracy = 0
     coverage = {}
     missing = []
+    previous_result = None
+    previous_state = None
 
     while feedback_attempt <= MAX_FEEDBACK_RETRIES:
         print(f"\nValidation attempt #{feedback_attempt + 1}")
 
-        coverage, missing, completeness, accuracy = validate_testcases(
-            requirement_file=PROCESSED_SSD_FILE,
-            testcase_file=GENERATED_TESTCASES_FILE,
+        # Rows added since the last attempt are all we need when nothing was replaced
+        current_state = store.state()
+        appended_only = (
+            previous_state is not None and current_state[0] == previous_state[0]
         )
 
+        if incremental and previous_result is not None and appended_only:
+            coverage, missing, completeness, accuracy = validate_incremental(
+                previous_result,
+                new_testcases=load_testcases(store.path, since_id=previous_state[1]),
+            )
+        else:
+            coverage, missing, completeness, accuracy = validate_testcases(
+                requirement_file=PROCESSED_SSD_FILE,
+                testcase_file=store.path if len(store) else GENERATED_TESTCASES_FILE,
+            )
+
+        previous_result = (coverage, missing, completeness, accuracy)
+        previous_state = current_state
+
         if completeness >= 95 or not missing:
             print(f"\nValidation passed with completeness {completeness}%")
             break
@@ -0,0 +1,114 @@
+"""
+Inference backend parity benchmark: torch vs torch-int8 / ONNX / ONNX int8.
+
+For each backend, embeds and NLI-scores the sample suites with caching
+off and reports the time, the speedup over float32 torch, and how far
+completeness/accuracy (and the set of missing requirements) drift from
+the torch reference. ONNX exports are created once under
+MODEL_EXPORT_DIR and reused. Needs sentence-transformers + torch, and
+optimum[onnxruntime] for the ONNX backends.
+
+Usage: python -m benchmarks.backend_parity [--backends torch onnx-int8] [--suite REQ_JSON TC_TXT]
+"""
+import argparse
+import time
+from pathlib import Path
+
+import embedding_cache
+import model_registry
+from config import (
+    PROCESSED_SSD_FILE,
+    GENERATED_TESTCASES_FILE,
+    INPUT_DIR,
+    SEMANTIC_THRESHOLD,
+    RETRIEVAL_MODE,
+)
+from validator.retrieval import find_candidates
+from validator.validator import (
+    load_requirements,
+    load_testcases,
+    predict_entailment,
+    summarize_validation,
+)
+
+DEFAULT_SUITES = [
+    (PROCESSED_SSD_FILE, GENERATED_TESTCASES_FILE),
+    (INPUT_DIR / "requirements.json", INPUT_DIR / "Driver_Age_testers_testcases.txt"),
+]
+
+
+def use_backend(backend):
+    model_registry.unload_models()
+    model_registry.DEFAULT_BACKENDS["embedder"] = backend
+    model_registry.DEFAULT_BACKENDS["cross_encoder"] = backend
+
+
+def validate(requirements, testcases):
+    """validate_testcases without the caches, so every run hits the models."""
+    embeddings = embedding_cache.embed_texts([r["text"] for r in requirements] + testcases)
+    req_emb, tc_emb = embeddings[:len(requirements)], embeddings[len(requirements):]
+
+    req_idx, tc_idx, _ = find_candidates(req_emb, tc_emb, SEMANTIC_THRESHOLD, mode=RETRIEVAL_MODE)
+    pairs = [(testcases[j], requirements[i]["text"]) for i, j in zip(req_idx, tc_idx)]
+    entailment = predict_entailment(pairs, workers=1)
+
+    _, missing, completeness, accuracy = summarize_validation(
+        requirements, testcases, req_idx, tc_idx, entailment
+    )
+    return completeness, accuracy, {m["requirement"] for m in missing}
+
+
+def run_suites(suites):
+    # Warm-up so model loading / export is not timed
+    validate(*suites[0])
+
+    results = []
+    start = time.perf_counter()
+    for requirements, testcases in suites:
+        results.append(validate(requirements, testcases))
+    return results, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--backends", nargs="+", default=list(model_registry.BACKENDS),
+                        choices=model_registry.BACKENDS)
+    parser.add_argument("--suite", nargs=2, type=Path, action="append",
+                        metavar=("REQ_JSON", "TC_TXT"))
+    args = parser.parse_args()
+
+    embedding_cache.EMBEDDING_CACHE_ENABLED = False
+
+    suites = [
+        (load_requirements(req_file), load_testcases(tc_file))
+        for req_file, tc_file in (args.suite or DEFAULT_SUITES)
+    ]
+    backends = ["torch"] + [b for b in args.backends if b != "torch"]
+
+    reference = None
+    ref_time = None
+    print(f"{'backend':>10s} {'time (s)':>9s} {'speedup':>8s} "
+          f"{'max Δcompl':>11s} {'max Δacc':>9s} {'flipped reqs':>13s}")
+
+    for backend in backends:
+        use_backend(backend)
+        try:
+            results, elapsed = run_suites(suites)
+        except ImportError as e:
+            print(f"{backend:>10s} skipped ({e})")
+            continue
+
+        if reference is None:
+            reference, ref_time = results, elapsed
+
+        d_completeness = max(abs(r[0] - ref[0]) for r, ref in zip(results, reference))
+        d_accuracy = max(abs(r[1] - ref[1]) for r, ref in zip(results, reference))
+        flipped = sum(len(r[2] ^ ref[2]) for r, ref in zip(results, reference))
+        print(f"{backend:>10s} {elapsed:9.2f} {ref_time / elapsed:8.2f} "
+              f"{d_completeness:10.2f}% {d_accuracy:8.2f}% {flipped:13d}")
+
+    model_registry.unload_models()
+
+
+if __name__ == "__main__":
+    main()
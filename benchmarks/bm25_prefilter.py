@@ -0,0 +1,58 @@
+"""
+BM25 prefilter benchmark: completeness and runtime vs BM25_TOP_N.
+
+Runs validate_testcases once without the prefilter (reference) and then
+with the BM25 prefilter at several shortlist sizes, reporting how much
+completeness each setting gives up and how long it takes. Needs the
+real embedding and NLI models.
+
+Usage: python -m benchmarks.bm25_prefilter [--requirements JSON] [--testcases TXT] [--top-n 10 25 50]
+"""
+import argparse
+import contextlib
+import io
+import time
+from pathlib import Path
+
+from config import PROCESSED_SSD_FILE, GENERATED_TESTCASES_FILE
+from validator.validator import validate_testcases
+
+
+def run(requirement_file, testcase_file, **kwargs):
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        coverage, missing, completeness, accuracy = validate_testcases(
+            requirement_file=requirement_file,
+            testcase_file=testcase_file,
+            **kwargs,
+        )
+    return completeness, accuracy, time.perf_counter() - start, missing
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requirements", type=Path, default=PROCESSED_SSD_FILE)
+    parser.add_argument("--testcases", type=Path, default=GENERATED_TESTCASES_FILE)
+    parser.add_argument("--top-n", type=int, nargs="+", default=[5, 10, 25, 50, 100])
+    args = parser.parse_args()
+
+    # Warm-up so model loading is not charged to the first setting
+    run(args.requirements, args.testcases)
+
+    ref_completeness, ref_accuracy, ref_time, ref_missing = run(args.requirements, args.testcases)
+    ref_missing = {m["requirement"] for m in ref_missing}
+
+    print(f"{'setting':>12s} {'completeness':>13s} {'accuracy':>9s} {'time (s)':>9s} {'lost reqs':>10s}")
+    print(f"{'no filter':>12s} {ref_completeness:12.2f}% {ref_accuracy:8.2f}% {ref_time:9.2f} {0:10d}")
+
+    for top_n in args.top_n:
+        completeness, accuracy, elapsed, missing = run(
+            args.requirements, args.testcases,
+            bm25_prefilter=True, bm25_top_n=top_n,
+        )
+        lost = len({m["requirement"] for m in missing} - ref_missing)
+        print(f"{'top ' + str(top_n):>12s} {completeness:12.2f}% {accuracy:8.2f}% {elapsed:9.2f} {lost:10d}")
+
+
+if __name__ == "__main__":
+    main()
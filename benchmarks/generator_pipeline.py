@@ -0,0 +1,99 @@
+"""
+Generator benchmark on the offline fake LLM backend.
+
+Runs run_generator over the bundled classified SSD (or --requirements)
+into a temporary output directory with a FakeLLMBackend of the given
+latency, throughput and failure rate, for each concurrency level. Reports
+wall time, time to first testcase, testcases written and simulated
+failures. Needs no Ollama server, network or GPU; the LLM response
+cache is bypassed and embedding de-duplication is off unless --dedup.
+
+Usage: python -m benchmarks.generator_pipeline [--latency S] [--tokens-per-s N]
+       [--failure-rate P] [--concurrency 1 4 8] [--streaming] [--dedup]
+"""
+import argparse
+import contextlib
+import io
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from config import PROCESSED_SSD_FILE
+from generator import generator
+from generator.llm_backends import FakeLLMBackend
+from testcase_store import TestcaseStore, testcase_store_file
+
+
+def run(requirements, backend, concurrency, streaming):
+    workdir = Path(tempfile.mkdtemp(prefix="generator-bench-"))
+    try:
+        master = workdir / "requirements.json"
+        shutil.copy(requirements, master)
+        output = workdir / "testcases.txt"
+
+        first = []
+        start = time.perf_counter()
+
+        def on_testcase(section, kind, testcase):
+            if not first:
+                first.append(time.perf_counter() - start)
+
+        generator.set_llm_backend(backend)
+        with contextlib.redirect_stdout(io.StringIO()):
+            generator.run_generator(
+                master_requirement_file=master,
+                new_requirement_file=None,
+                output_testcase_file=output,
+                hash_file=workdir / "requirements.hash",
+                use_cache=False,
+                streaming=streaming,
+                on_testcase=on_testcase if streaming else None,
+                concurrency=concurrency,
+            )
+        elapsed = time.perf_counter() - start
+
+        store = TestcaseStore(testcase_store_file(output))
+        written = len(store)
+        store.close()
+        return elapsed, (first[0] if first else elapsed), written
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requirements", type=Path, default=PROCESSED_SSD_FILE)
+    parser.add_argument("--latency", type=float, default=0.5)
+    parser.add_argument("--tokens-per-s", type=float, default=200.0)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--streaming", action="store_true")
+    parser.add_argument("--dedup", action="store_true")
+    args = parser.parse_args()
+
+    generator.DEDUP_ENABLED = args.dedup
+    generator.LLM_RETRY_BACKOFF_S = 0.0
+
+    print(f"{'concurrency':>11s} {'time (s)':>9s} {'first tc (s)':>13s} "
+          f"{'testcases':>10s} {'LLM calls':>10s} {'failures':>9s}")
+
+    for concurrency in args.concurrency:
+        backend = FakeLLMBackend(
+            latency_s=args.latency,
+            tokens_per_s=args.tokens_per_s,
+            failure_rate=args.failure_rate,
+            seed=args.seed,
+        )
+        try:
+            elapsed, first, written = run(args.requirements, backend, concurrency, args.streaming)
+        except Exception as e:
+            print(f"{concurrency:11d} failed: {e}")
+            continue
+        print(f"{concurrency:11d} {elapsed:9.2f} {first:13.2f} "
+              f"{written:10d} {backend.calls:10d} {backend.failures:9d}")
+
+
+if __name__ == "__main__":
+    main()
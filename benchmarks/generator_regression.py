@@ -0,0 +1,291 @@
+"""
+Generator regression check on the offline fake LLM backend.
+
+Drives run_generator through its incremental branches in a temporary
+directory: fresh run, unchanged rerun, requirements added to a section,
+a requirement edited, a section removed, a feedback append, a
+de-duplicated feedback append followed by a rewrite of another section,
+and output from before section fingerprints (legacy whole-SSD hash).
+After each step it checks how many prompts were sent and which
+testcases (and ids) are active in the testcase store. Needs no Ollama
+server, network or GPU; the LLM response cache is off and
+de-duplication only runs in its own branch (it loads the embedding
+model).
+
+Usage: python -m benchmarks.generator_regression [--keep]
+"""
+import argparse
+import contextlib
+import io
+import json
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+from generator import generator
+from generator.llm_backends import FakeLLMBackend
+from testcase_store import TestcaseStore, testcase_store_file
+
+
+MASTER = {
+    "Driver Details": [
+        "The system shall reject additional drivers younger than 18 years.",
+        "The system shall show the error Applicant Age not in Range for invalid ages.",
+    ],
+    "Payments": [
+        "The system shall accept card payments up to 10000 EUR.",
+    ],
+    "Reports": [
+        "The system shall export the policy summary as PDF.",
+    ],
+}
+ADDED = "The system shall allow the user to reset the additional driver form."
+EDITED = "The system shall accept card payments up to 5000 EUR."
+FEEDBACK = "The system shall refund cancelled payments within 5 days."
+NEAR_DUPLICATE = "The system shall reject additional drivers younger than 18 years old."
+
+
+# ================================
+# Harness
+# ================================
+class Workspace:
+    """One output directory, run through run_generator step by step."""
+
+    def __init__(self, workdir: Path, backend: FakeLLMBackend):
+        self.master = workdir / "requirements.json"
+        self.new = workdir / "new_requirements.json"
+        self.output = workdir / "testcases.txt"
+        self.hash_file = workdir / "requirements.hash"
+        self.backend = backend
+
+    def run(self, master, new=None):
+        """Run the generator on `master` (+ feedback `new`); returns prompts sent."""
+        self.master.write_text(json.dumps(master, indent=2), encoding="utf-8")
+        if new is not None:
+            self.new.write_text(json.dumps(new, indent=2), encoding="utf-8")
+
+        calls = self.backend.calls
+        generator.set_llm_backend(self.backend)
+        with contextlib.redirect_stdout(io.StringIO()):
+            generator.run_generator(
+                master_requirement_file=self.master,
+                new_requirement_file=self.new if new is not None else None,
+                output_testcase_file=self.output,
+                hash_file=self.hash_file,
+                use_cache=False,
+            )
+        return self.backend.calls - calls
+
+    def rows(self):
+        store = TestcaseStore(testcase_store_file(self.output))
+        try:
+            return store.rows()
+        finally:
+            store.close()
+
+
+def ids(rows, section=None):
+    return {row["id"] for row in rows if section is None or row["section"] == section}
+
+
+def expect(failures, condition, message):
+    if not condition:
+        failures.append(message)
+
+
+def report(name, failures):
+    print(f"{name:24s} {'PASS' if not failures else 'FAIL'}")
+    for failure in failures:
+        print(f"    - {failure}")
+    return not failures
+
+
+# ================================
+# Branches
+# ================================
+def check_incremental(ws: Workspace):
+    results = []
+    master = json.loads(json.dumps(MASTER))
+    h = generator.requirement_hash
+
+    # -------- Fresh output --------
+    failures = []
+    prompts = ws.run(master)
+    fresh = ws.rows()
+    expect(failures, prompts == len(master), f"{prompts} prompts, expected {len(master)}")
+    for section, requirements in master.items():
+        expect(failures, ids(fresh, section), f"no active testcases for {section}")
+    for row in fresh:
+        linked = {h(r) for r in master[row["section"]]}
+        expect(failures, row["requirements"] and set(row["requirements"]) <= linked,
+               f"testcase {row['id']} linked to {row['requirements']}")
+    results.append(report("fresh", failures))
+
+    # -------- Unchanged rerun --------
+    failures = []
+    prompts = ws.run(master)
+    expect(failures, prompts == 0, f"{prompts} prompts, expected 0")
+    expect(failures, ids(ws.rows()) == ids(fresh), "active ids changed")
+    results.append(report("unchanged", failures))
+
+    # -------- Requirement added to a section --------
+    failures = []
+    master["Driver Details"].append(ADDED)
+    prompts = ws.run(master)
+    added = ws.rows()
+    new_rows = [row for row in added if row["id"] not in ids(fresh)]
+    expect(failures, prompts == 1, f"{prompts} prompts, expected 1")
+    expect(failures, ids(fresh) <= ids(added), "earlier testcases were deactivated")
+    expect(failures, new_rows, "no testcases for the added requirement")
+    expect(failures, all(row["id"] > max(ids(fresh)) for row in new_rows), "new rows reuse old ids")
+    expect(failures, all(row["requirements"] == [h(ADDED)] for row in new_rows),
+           "new rows not linked to the added requirement only")
+    results.append(report("added only", failures))
+
+    # -------- Requirement edited --------
+    failures = []
+    master["Payments"] = [EDITED]
+    prompts = ws.run(master)
+    edited = ws.rows()
+    expect(failures, prompts == 1, f"{prompts} prompts, expected 1")
+    for section in ("Driver Details", "Reports"):
+        expect(failures, ids(edited, section) == ids(added, section), f"{section} ids changed")
+    expect(failures, not ids(edited, "Payments") & ids(added, "Payments"),
+           "testcases of the edited requirement are still active")
+    expect(failures, ids(edited, "Payments"), "no testcases for the edited requirement")
+    expect(failures, all(row["requirements"] == [h(EDITED)]
+                         for row in edited if row["section"] == "Payments"),
+           "Payments rows not linked to the edited requirement")
+    results.append(report("edited", failures))
+
+    # -------- Section removed --------
+    failures = []
+    del master["Reports"]
+    prompts = ws.run(master)
+    removed = ws.rows()
+    expect(failures, prompts == 0, f"{prompts} prompts, expected 0")
+    expect(failures, not ids(removed, "Reports"), "testcases of the removed section are still active")
+    expect(failures, ids(removed) == ids(edited) - ids(edited, "Reports"), "other ids changed")
+    results.append(report("removed", failures))
+
+    # -------- Feedback append (missing requirements) --------
+    failures = []
+    prompts = ws.run(master, new={"Payments": [FEEDBACK]})
+    appended = ws.rows()
+    new_rows = [row for row in appended if row["id"] not in ids(removed)]
+    expect(failures, prompts == 1, f"{prompts} prompts, expected 1")
+    expect(failures, ids(removed) <= ids(appended), "earlier testcases were deactivated")
+    expect(failures, new_rows, "no testcases appended")
+    expect(failures, all(row["id"] > max(ids(removed)) for row in new_rows), "appended rows reuse old ids")
+    expect(failures, all(row["requirements"] == [h(FEEDBACK)] for row in new_rows),
+           "appended rows not linked to the feedback requirement")
+    stored = json.loads(ws.master.read_text(encoding="utf-8"))
+    expect(failures, FEEDBACK in stored["Payments"], "feedback requirement not merged into the master file")
+    expect(failures, json.loads(ws.new.read_text(encoding="utf-8")) == {}, "feedback file not cleared")
+    results.append(report("feedback append", failures))
+
+    return results
+
+
+def check_dedup_rewrite(ws: Workspace):
+    """A de-duplicated feedback append must survive a later rewrite of another section."""
+    results = []
+    master = json.loads(json.dumps(MASTER))
+    h = generator.requirement_hash
+
+    ws.run(master)
+    generator.DEDUP_ENABLED = True
+    try:
+        # -------- Feedback append of a near-duplicate requirement --------
+        failures = []
+        ws.run(master, new={"Driver Details": [NEAR_DUPLICATE]})
+        appended = ws.rows()
+        merged = [row for row in appended if h(NEAR_DUPLICATE) in row["requirements"]]
+        expect(failures, merged, "near-duplicate requirement not linked to any testcase")
+        expect(failures, any(len(row["requirements"]) > 1 for row in merged),
+               "no near-duplicate merged into an existing testcase")
+        results.append(report("append with dedup", failures))
+
+        # -------- Rewrite triggered by another section --------
+        failures = []
+        master = json.loads(ws.master.read_text(encoding="utf-8"))
+        master["Payments"] = [EDITED]
+        prompts = ws.run(master)
+        rewritten = ws.rows()
+        expect(failures, prompts == 1, f"{prompts} prompts, expected 1")
+        before = {row["id"]: row["requirements"] for row in appended if row["section"] == "Driver Details"}
+        after = {row["id"]: row["requirements"] for row in rewritten if row["section"] == "Driver Details"}
+        expect(failures, set(after) == set(before),
+               f"Driver Details went from {len(before)} to {len(after)} active testcases")
+        expect(failures, all(after[i] == before[i] for i in set(after) & set(before)),
+               "merged requirement links were lost")
+        results.append(report("dedup, then rewrite", failures))
+    finally:
+        generator.DEDUP_ENABLED = False
+
+    return results
+
+
+def check_legacy(ws: Workspace):
+    """Output written before fingerprints and the store: only testcases.txt + the SSD hash."""
+    results = []
+    master = json.loads(json.dumps(MASTER))
+
+    ws.run(master)
+    texts = [row["text"] for row in ws.rows()]
+    generator.fingerprint_file(ws.output).unlink()
+    testcase_store_file(ws.output).unlink()
+
+    # -------- Same SSD hash: import, nothing generated --------
+    failures = []
+    prompts = ws.run(master)
+    expect(failures, prompts == 0, f"{prompts} prompts, expected 0")
+    expect(failures, [row["text"] for row in ws.rows()] == texts,
+           "imported testcases differ from testcases.txt")
+    expect(failures, not generator.fingerprint_file(ws.output).exists(),
+           "fingerprints written without generating")
+    results.append(report("legacy hash, unchanged", failures))
+
+    # -------- Changed SSD hash: everything regenerated --------
+    failures = []
+    master["Payments"] = [EDITED]
+    prompts = ws.run(master)
+    rows = ws.rows()
+    expect(failures, prompts == len(master), f"{prompts} prompts, expected {len(master)}")
+    expect(failures, generator.fingerprint_file(ws.output).exists(), "fingerprints not written")
+    expect(failures, {row["section"] for row in rows} == set(master), "sections missing from the store")
+    results.append(report("legacy hash, changed", failures))
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--keep", action="store_true", help="keep the temporary directories")
+    args = parser.parse_args()
+
+    generator.DEDUP_ENABLED = False
+    generator.LLM_RETRY_BACKOFF_S = 0.0
+    backend = FakeLLMBackend(latency_s=0.0, tokens_per_s=0.0)
+
+    results = []
+    for check in (check_incremental, check_dedup_rewrite, check_legacy):
+        workdir = Path(tempfile.mkdtemp(prefix="generator-regression-"))
+        try:
+            results.extend(check(Workspace(workdir, backend)))
+        finally:
+            if args.keep:
+                print(f"    (kept {workdir})")
+            else:
+                shutil.rmtree(workdir, ignore_errors=True)
+
+    if not all(results):
+        print(f"\n{results.count(False)} generator branch(es) failed.")
+        sys.exit(1)
+
+    print("\nAll generator branches behave as expected.")
+
+
+if __name__ == "__main__":
+    main()
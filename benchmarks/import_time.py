@@ -0,0 +1,92 @@
+"""
+Import-time regression benchmark.
+
+Imports each pipeline entry module in a fresh interpreter and fails if it
+takes longer than the budget or pulls in a heavy ML dependency.
+
+Usage: python -m benchmarks.import_time [--budget SECONDS] [--repeat N]
+"""
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+MODULES = [
+    "app",
+    "validator.cli",
+    "validator.validator",
+    "generator.generator",
+    "data_processing.raw_extraction",
+    "data_processing.data_classification",
+    "data_processing.ssd_cache",
+]
+
+HEAVY_MODULES = [
+    "torch",
+    "sentence_transformers",
+    "transformers",
+    "sklearn",
+    "scipy",
+    "langchain_core",
+    "langchain_community",
+    "langgraph",
+    "docx",
+]
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+heavy = [m for m in {heavy!r} if m in sys.modules]
+print(json.dumps({{"seconds": elapsed, "heavy": heavy}}))
+"""
+
+
+def measure(module: str) -> dict:
+    code = PROBE.format(module=module, heavy=HEAVY_MODULES)
+    out = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--budget", type=float, default=0.5)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    failures = []
+    for module in MODULES:
+        runs = [measure(module) for _ in range(args.repeat)]
+        best = min(r["seconds"] for r in runs)
+        heavy = sorted({m for r in runs for m in r["heavy"]})
+
+        status = "ok"
+        if best > args.budget:
+            status = "SLOW"
+        if heavy:
+            status = "HEAVY"
+        if status != "ok":
+            failures.append(module)
+
+        extra = f"  imports: {', '.join(heavy)}" if heavy else ""
+        print(f"{module:40s} {best * 1000:8.1f} ms  {status}{extra}")
+
+    if failures:
+        print(f"\nImport-time regression in: {', '.join(failures)}")
+        sys.exit(1)
+
+    print("\nAll modules import within budget.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+NLI scaling benchmark: serial vs process-pool sharded scoring.
+
+Builds (testcase, requirement) pairs from the bundled sample data,
+repeats them to the requested size, and times predict_entailment with
+1..N workers. Every parallel run is checked against the serial scores.
+Needs the real cross-encoder (sentence-transformers + torch).
+
+Usage: python -m benchmarks.nli_scaling [--pairs N] [--max-workers N]
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+
+from config import PROCESSED_SSD_FILE, GENERATED_TESTCASES_FILE, NLI_BATCH_SIZE
+from validator.validator import load_requirements, load_testcases, predict_entailment
+from validator.parallel import shutdown_pool
+
+
+def sample_pairs(n_pairs):
+    requirements = [r["text"] for r in load_requirements(PROCESSED_SSD_FILE)]
+    testcases = load_testcases(GENERATED_TESTCASES_FILE)
+    base = [(tc, req) for req in requirements for tc in testcases]
+    return (base * (n_pairs // len(base) + 1))[:n_pairs]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pairs", type=int, default=2048)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--batch-size", type=int, default=NLI_BATCH_SIZE)
+    args = parser.parse_args()
+
+    pairs = sample_pairs(args.pairs)
+    print(f"{len(pairs)} pairs, batch size {args.batch_size}\n")
+    print(f"{'workers':>8s} {'time (s)':>10s} {'pairs/s':>10s} {'speedup':>8s} {'identical':>10s}")
+
+    # Warm up first so model loading is not timed
+    predict_entailment(pairs[:args.batch_size], batch_size=args.batch_size, workers=1)
+
+    start = time.perf_counter()
+    serial = predict_entailment(pairs, batch_size=args.batch_size, workers=1)
+    serial_time = time.perf_counter() - start
+    print(f"{1:8d} {serial_time:10.2f} {len(pairs) / serial_time:10.1f} {1.0:8.2f} {'-':>10s}")
+
+    workers = 2
+    while workers <= args.max_workers:
+        predict_entailment(pairs[:args.batch_size], batch_size=args.batch_size, workers=workers)
+
+        start = time.perf_counter()
+        scores = predict_entailment(pairs, batch_size=args.batch_size, workers=workers)
+        elapsed = time.perf_counter() - start
+
+        identical = np.array_equal(scores, serial)
+        print(f"{workers:8d} {elapsed:10.2f} {len(pairs) / elapsed:10.1f} "
+              f"{serial_time / elapsed:8.2f} {str(identical):>10s}")
+        workers *= 2
+
+    shutdown_pool()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Candidate retrieval benchmark: exhaustive vs exact top-k vs IVF.
+
+Uses synthetic clustered embeddings (no models needed) and reports, for
+each mode, wall time and recall of the exhaustive top-k candidate pairs.
+
+Usage: python -m benchmarks.retrieval [--requirements N] [--testcases N] [--k K]
+"""
+import argparse
+import time
+
+import numpy as np
+
+from config import SEMANTIC_THRESHOLD
+from validator.retrieval import (
+    exhaustive_candidates,
+    topk_candidates,
+    IVFIndex,
+)
+
+
+def synthetic_embeddings(n_req, n_tc, dim, n_topics, seed=0):
+    rng = np.random.default_rng(seed)
+    topics = rng.normal(size=(n_topics, dim))
+
+    def sample(n, noise):
+        base = topics[rng.integers(0, n_topics, size=n)]
+        emb = base + noise * rng.normal(size=(n, dim))
+        return (emb / np.linalg.norm(emb, axis=1, keepdims=True)).astype(np.float32)
+
+    return sample(n_req, 0.6), sample(n_tc, 0.8)
+
+
+def exhaustive_topk(req_emb, tc_emb, threshold, k):
+    """Ground truth: exhaustive candidates, capped to the k most similar."""
+    req_idx, tc_idx, sims = exhaustive_candidates(req_emb, tc_emb, threshold)
+    truth = set()
+    for i in np.unique(req_idx):
+        rows = np.flatnonzero(req_idx == i)
+        top = rows[np.argsort(-sims[rows], kind="stable")[:k]]
+        truth.update((int(i), int(j)) for j in tc_idx[top])
+    return truth
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requirements", type=int, default=300)
+    parser.add_argument("--testcases", type=int, default=30000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--topics", type=int, default=200)
+    parser.add_argument("--k", type=int, default=20)
+    parser.add_argument("--threshold", type=float, default=SEMANTIC_THRESHOLD)
+    args = parser.parse_args()
+
+    req_emb, tc_emb = synthetic_embeddings(
+        args.requirements, args.testcases, args.dim, args.topics
+    )
+    truth = exhaustive_topk(req_emb, tc_emb, args.threshold, args.k)
+
+    modes = {
+        "exhaustive": lambda: exhaustive_candidates(req_emb, tc_emb, args.threshold),
+        "topk": lambda: topk_candidates(req_emb, tc_emb, args.threshold, k=args.k),
+    }
+
+    index, build_time = timed(lambda: IVFIndex().build(tc_emb))
+    modes["ivf (search)"] = lambda: index.search(req_emb, args.threshold, k=args.k)
+
+    print(f"{args.requirements} requirements x {args.testcases} testcases, "
+          f"k={args.k}, threshold={args.threshold}, truth pairs={len(truth)}\n")
+    print(f"{'mode':14s} {'time (s)':>10s} {'pairs':>10s} {'recall@k':>10s}")
+
+    for name, fn in modes.items():
+        (req_idx, tc_idx, _), elapsed = timed(fn)
+        found = set(zip(req_idx.tolist(), tc_idx.tolist()))
+        recall = len(found & truth) / len(truth) if truth else 1.0
+        print(f"{name:14s} {elapsed:10.3f} {len(found):10d} {recall:10.3f}")
+
+    print(f"\nIVF build (one-off per testcase suite): {build_time:.3f} s")
+
+
+if __name__ == "__main__":
+    main()
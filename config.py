@@ -12,6 +12,58 @@ MODE = "INTEGRATED"
 SEMANTIC_THRESHOLD = 0.55
 NLI_THRESHOLD = 0.6
 
+# Candidate pairs scored per cross-encoder forward pass
+NLI_BATCH_SIZE = 32
+
+# Parallel NLI: >1 shards candidate pairs across worker processes
+NLI_WORKERS = 1
+NLI_THREADS_PER_WORKER = None   # torch threads per worker; None -> cpu_count // workers
+NLI_SHARD_SIZE = 256            # pairs per task, rounded up to a multiple of NLI_BATCH_SIZE
+
+# Coverage-only mode (CI gating): stop at the first entailed candidate per
+# requirement; accuracy is then only sampled from those matches
+COVERAGE_ONLY = False
+COVERAGE_PROBE_SIZE = 1         # candidates per requirement per NLI round
+
+# Cascade: a cheap first stage settles clear pairs, only pairs with
+# CASCADE_LOW <= stage-1 score < CASCADE_HIGH are escalated to NLI_MODEL.
+# Stage 1 is CASCADE_CHEAP_MODEL's entailment probability, or the embedding
+# similarity when it is None. With similarity as stage 1, candidates already
+# have similarity >= SEMANTIC_THRESHOLD, so a CASCADE_LOW above it rejects
+# [SEMANTIC_THRESHOLD, CASCADE_LOW) without NLI; the default band starts there.
+# Accuracy is reported from NLI-scored pairs only.
+CASCADE_ENABLED = False
+CASCADE_CHEAP_MODEL = None      # e.g. "cross-encoder/nli-MiniLM2-L6-H768"
+CASCADE_LOW = SEMANTIC_THRESHOLD
+CASCADE_HIGH = 0.90
+
+# BM25 lexical prefilter: only the top-N lexical matches per requirement are
+# embedded and scored (raise BM25_TOP_N for more recall)
+BM25_PREFILTER = False
+BM25_TOP_N = 50
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+# Warm validator service (python -m validator.service). When the URL is set,
+# validate_testcases sends jobs there instead of loading models locally.
+VALIDATOR_SERVICE_URL = None    # e.g. "http://127.0.0.1:8765"
+VALIDATOR_SERVICE_HOST = "127.0.0.1"
+VALIDATOR_SERVICE_PORT = 8765
+VALIDATOR_BATCH_WINDOW_MS = 20  # wait this long to batch concurrent jobs together
+VALIDATOR_MAX_BATCH_JOBS = 16
+
+# Candidate retrieval: "exhaustive" | "blocked" | "topk" (exact) | "ivf" (approximate)
+RETRIEVAL_MODE = "exhaustive"
+RETRIEVAL_TOP_K = 20            # max candidates per requirement (topk / ivf)
+RETRIEVAL_BLOCK_SIZE = 4096     # testcases scored per block
+IVF_NLIST = None                # clusters; None -> sqrt(#testcases)
+IVF_NPROBE = 8                  # clusters searched per requirement
+
+# Blocked similarity: tile sizes are shrunk as needed to respect the cap
+SIMILARITY_TILE_ROWS = 256      # requirements per tile
+SIMILARITY_TILE_COLS = 4096     # testcases per tile
+SIMILARITY_MEMORY_CAP_MB = 512  # embeddings + tiles + candidate pairs
+
 # Final decision thresholds (%)
 COMPLETENESS_THRESHOLD = 80.0
 ACCURACY_THRESHOLD = 75.0
@@ -21,16 +73,97 @@ ACCURACY_THRESHOLD = 75.0
 
 MAX_FEEDBACK_RETRIES = 2
 
+# Feedback iterations only validate missing requirements against newly appended testcases
+INCREMENTAL_VALIDATION = True
+
 # GENERATOR FLAGS
 
 FORCE_REGENERATE = False
 
+# Sections generated at once (Ollama serves them in parallel up to OLLAMA_NUM_PARALLEL)
+GENERATION_CONCURRENCY = 4
+
+# Near-duplicate filter for appended (feedback) testcases: a new testcase whose
+# embedding similarity to an existing or earlier new one reaches the threshold
+# is dropped and its requirements are linked to the one it duplicates
+DEDUP_ENABLED = True
+DEDUP_THRESHOLD = 0.92
+DEDUP_RETRIEVAL_MODE = "ivf"    # any validator retrieval mode; "ivf" scales with suite size
+DEDUP_BLOCK_SIZE = 256          # new testcases compared with each other at once
+
+# Stream completions token by token; finished testcases are flushed to
+# testcases.stream.jsonl (next to testcases.txt) as soon as they are parsed
+STREAMING_GENERATION = False
+
+# LLM used by the generator
+# Backend: "ollama" (local Ollama server) | "fake" (offline stand-in for benchmarks / CI)
+LLM_BACKEND = "ollama"
+LLM_MODEL = "mistral"
+LLM_TEMPERATURE = 0.2
+
+# Retries per section when the LLM call fails (exponential backoff)
+LLM_MAX_RETRIES = 2
+LLM_RETRY_BACKOFF_S = 1.0
+
+# Fake backend: deterministic Positive/Negative/Boundary output
+FAKE_LLM_LATENCY_S = 0.5        # before the first token
+FAKE_LLM_TOKENS_PER_S = 50.0    # 0 -> instant
+FAKE_LLM_FAILURE_RATE = 0.0     # fraction of calls that raise
+FAKE_LLM_SEED = 0
+
+# Context window per LLM call (sent to Ollama as num_ctx; 2048 is its default).
+# It holds the prompt template, the requirement text and the completion: the
+# requirement text per prompt is what remains after the template and
+# GENERATION_OUTPUT_TOKENS, and larger sections are split into several prompts
+LLM_CONTEXT_TOKENS = 2048
+GENERATION_OUTPUT_TOKENS = 768  # reserved for the generated testcases
+
+# LLM RESPONSE CACHE (completions keyed by model, temperature, prompt template and section text)
+
+LLM_CACHE_ENABLED = True            # False bypasses the cache for every call
+LLM_CACHE_MAX_ENTRIES = 5_000
+LLM_CACHE_MAX_MB = 64               # total size of cached completions; LRU evicted first
+
+# EXTRACTION
+
+# Read document.xml / styles.xml directly instead of building a python-docx Document
+STREAMING_EXTRACTION = True
+
+# MODELS (loaded on first use via model_registry)
+
+EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L12-v2"
+NLI_MODEL = "cross-encoder/nli-deberta-v3-small"
+
+# Inference backend per model: "torch" | "torch-int8" | "onnx" | "onnx-int8"
+# (ONNX backends need optimum[onnxruntime]; exports are cached in MODEL_EXPORT_DIR,
+# or run `python -m model_registry` once)
+EMBEDDING_BACKEND = "torch"
+NLI_BACKEND = "torch"
+ONNX_QUANTIZATION_CONFIG = "avx2"   # "arm64" | "avx2" | "avx512" | "avx512_vnni"
+
+# CLASSIFIER
+
+CLASSIFIER_MODEL = EMBEDDING_MODEL
+IMPORTANCE_THRESHOLD = 0.4
+
+# EMBEDDING CACHE (shared by classifier and validator)
+
+EMBEDDING_CACHE_ENABLED = True
+EMBEDDING_CACHE_MAX_ENTRIES = 200_000   # per model, least recently used evicted first
+
+# NLI SCORE CACHE (entailment per testcase/requirement pair, across iterations and runs)
+
+NLI_CACHE_ENABLED = True
+
 # 4) Data / Output Paths
 
 BASE_DIR = Path(__file__).parent
 DATA_DIR = BASE_DIR / "data"
 INPUT_DIR = DATA_DIR / "input"
 OUTPUT_DIR = DATA_DIR / "output"
+CACHE_DIR = OUTPUT_DIR / "cache"
+
+SSD_DOCX_FILE = INPUT_DIR / "ssd.docx"
 
 
 PROCESSED_SSD_FILE = OUTPUT_DIR / "json_data/classified_file.json"          
@@ -39,3 +172,8 @@ NEW_REQUIREMENT_FILE = OUTPUT_DIR / "json_data/new_requirement.json"
 HASH_FILE = OUTPUT_DIR / "testcases/requirement_hash.txt"
 GENERATED_TESTCASES_FILE = OUTPUT_DIR / "testcases/testcases.txt"
 VALIDATION_REPORT_FILE = OUTPUT_DIR / "json_data/validation_report.json"
+SSD_CACHE_DIR = CACHE_DIR / "ssd"
+EMBEDDING_CACHE_DIR = CACHE_DIR / "embeddings"
+NLI_CACHE_FILE = CACHE_DIR / "nli_scores.sqlite"
+LLM_CACHE_FILE = CACHE_DIR / "llm_responses.sqlite"
+MODEL_EXPORT_DIR = CACHE_DIR / "models"
@@ -1,13 +1,12 @@
 import json
 import re
 from collections import defaultdict
-from sentence_transformers import SentenceTransformer, util
 
+from config import CLASSIFIER_MODEL, IMPORTANCE_THRESHOLD
 
 
-# Load MiniLM Model
-MODEL_NAME = "sentence-transformers/all-MiniLM-L12-v2"
-model = SentenceTransformer(MODEL_NAME)
+# MiniLM Model (loaded on first cache miss, see embedding_cache)
+MODEL_NAME = CLASSIFIER_MODEL
 
 
 # Reference Testable Requirements
@@ -22,10 +21,15 @@ REFERENCE_REQUIREMENTS = [
     "The system should trigger a warning"
 ]
 
-REFERENCE_EMBEDDINGS = model.encode(
-    REFERENCE_REQUIREMENTS,
-    normalize_embeddings=True
-)
+_reference_embeddings = {}
+
+
+def get_reference_embeddings():
+    from embedding_cache import embed_texts
+
+    if MODEL_NAME not in _reference_embeddings:
+        _reference_embeddings[MODEL_NAME] = embed_texts(REFERENCE_REQUIREMENTS, MODEL_NAME)
+    return _reference_embeddings[MODEL_NAME]
 
 
 # POSITIVE SIGNALS
@@ -60,7 +64,12 @@ def expand_bullets(text):
 # ================================
 # Importance Detection
 # ================================
-def is_important_requirement(text, semantic_threshold=0.4):
+def keyword_decision(text):
+    """
+    Cheap regex/length filters.
+
+    Returns True/False when they decide, None when the embedding check is needed.
+    """
     text = text.strip()
 
     if len(text.split()) < 6:
@@ -72,19 +81,52 @@ def is_important_requirement(text, semantic_threshold=0.4):
     if IMPORTANT_KEYWORDS.search(text):
         return True
 
-    embedding = model.encode(text, normalize_embeddings=True)
-    score = util.cos_sim(
-        embedding,
-        REFERENCE_EMBEDDINGS
-    ).max().item()
+    return None
+
+
+def semantic_scores(texts):
+    """Max similarity to the reference requirements for each text, in one batched pass."""
+    from sentence_transformers import util
+    from embedding_cache import embed_texts
+
+    embeddings = embed_texts(texts, MODEL_NAME)
+    return util.cos_sim(
+        embeddings,
+        get_reference_embeddings()
+    ).max(dim=1).values.tolist()
+
+
+def is_important_requirement(text, semantic_threshold=IMPORTANCE_THRESHOLD):
+    decision = keyword_decision(text)
+    if decision is not None:
+        return decision
 
-    return score >= semantic_threshold
+    return semantic_scores([text.strip()])[0] >= semantic_threshold
+
+
+def requirement_category(feature, sub_section):
+    cat = sub_section.lower()
+
+    if "functional" in cat:
+        return "Functional"
+    if "non-functional" in cat:
+        return "Non-Functional"
+    if "technical" in feature:
+        return "Technical"
+    if "business" in feature:
+        return "Business"
+    return "General"
 
 
 # Classification Logic
-def aggregate_important_requirements(structured_ssd: dict) -> dict:
-    
-    aggregated = defaultdict(list)
+def aggregate_important_requirements(
+    structured_ssd: dict,
+    semantic_threshold=IMPORTANCE_THRESHOLD
+) -> dict:
+
+    # Phase 1: regex + length filters, remember what still needs embedding
+    candidates = []
+    undecided = []
 
     for section in structured_ssd.get("sections", []):
         feature = (section.get("feature") or "").lower()
@@ -98,21 +140,25 @@ def aggregate_important_requirements(structured_ssd: dict) -> dict:
             if not text:
                 continue
 
-            if not is_important_requirement(text):
+            decision = keyword_decision(text)
+            if decision is False:
                 continue
 
-            cat = sub_section.lower()
-
-            if "functional" in cat:
-                aggregated["Functional"].append(text)
-            elif "non-functional" in cat:
-                aggregated["Non-Functional"].append(text)
-            elif "technical" in feature:
-                aggregated["Technical"].append(text)
-            elif "business" in feature:
-                aggregated["Business"].append(text)
-            else:
-                aggregated["General"].append(text)
+            if decision is None:
+                undecided.append(len(candidates))
+
+            candidates.append([requirement_category(feature, sub_section), text, decision])
+
+    # Phase 2: one batched encode + matrix product for the remaining candidates
+    if undecided:
+        scores = semantic_scores([candidates[i][1] for i in undecided])
+        for i, score in zip(undecided, scores):
+            candidates[i][2] = score >= semantic_threshold
+
+    aggregated = defaultdict(list)
+    for category, text, important in candidates:
+        if important:
+            aggregated[category].append(text)
 
     for key in [
         "Functional",
@@ -1,12 +1,205 @@
-from docx import Document
 import json
+import zipfile
 from pathlib import Path
+from xml.etree.ElementTree import iterparse
 
 
-def extract_docx_sections(file_path: str) -> dict:
+# Bump when extraction output changes so cached SSDs are invalidated
+EXTRACTOR_VERSION = "2"
+
+# WordprocessingML namespace used by document.xml / styles.xml
+W_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+DOCUMENT_XML = "word/document.xml"
+STYLES_XML = "word/styles.xml"
+
+# Same UI aliases python-docx applies to built-in style names
+STYLE_NAME_ALIASES = {
+    "caption": "Caption",
+    "footer": "Footer",
+    "header": "Header",
+    **{f"heading {i}": f"Heading {i}" for i in range(1, 10)},
+}
+
+
+# ================================
+# Section Grouping
+# ================================
+def group_sections(paragraphs):
+    """
+    Group (style_name, text) paragraph pairs into section dicts.
+
+    Yields {"feature", "sub_section", "content"} one section at a time.
+    """
+    current_feature = None
+    current_subsection = None
+    buffer = []
+
+    for style_name, text in paragraphs:
+        text = text.strip()
+        if not text:
+            continue
+
+        if style_name in ("Heading 1", "Heading 2"):
+            if current_feature and buffer:
+                yield {
+                    "feature": current_feature,
+                    "sub_section": current_subsection,
+                    "content": buffer
+                }
+            buffer = []
+
+            if style_name == "Heading 1":
+                current_feature = text
+                current_subsection = None
+            else:
+                current_subsection = text
+            continue
+
+        buffer.append(text)
+
+    if current_feature and buffer:
+        yield {
+            "feature": current_feature,
+            "sub_section": current_subsection,
+            "content": buffer
+        }
+
+
+# ================================
+# Streaming DOCX Reader
+# ================================
+def _is_on(value) -> bool:
+    return value in ("1", "true", "on")
+
+
+def load_paragraph_styles(docx_zip: zipfile.ZipFile):
+    """
+    Read styles.xml incrementally.
+
+    Returns ({style_id: ui_name}, default_style_name) for paragraph styles.
+    """
+    names = {}
+    default_name = ""
+
+    if STYLES_XML not in docx_zip.namelist():
+        return names, default_name
+
+    with docx_zip.open(STYLES_XML) as f:
+        for _, elem in iterparse(f, events=("end",)):
+            if elem.tag != W_NS + "style":
+                continue
+
+            if elem.get(W_NS + "type", "paragraph") == "paragraph":
+                name_el = elem.find(W_NS + "name")
+                name = name_el.get(W_NS + "val") if name_el is not None else None
+                name = STYLE_NAME_ALIASES.get(name, name) or ""
+
+                style_id = elem.get(W_NS + "styleId")
+                if style_id is not None and style_id not in names:
+                    names[style_id] = name
+                if _is_on(elem.get(W_NS + "default")):
+                    default_name = name
+
+            elem.clear()
+
+    return names, default_name
+
+
+def _run_text(run) -> str:
+    parts = []
+    for child in run:
+        tag = child.tag
+        if tag == W_NS + "t":
+            parts.append(child.text or "")
+        elif tag in (W_NS + "tab", W_NS + "ptab"):
+            parts.append("\t")
+        elif tag == W_NS + "br":
+            if child.get(W_NS + "type", "textWrapping") == "textWrapping":
+                parts.append("\n")
+        elif tag == W_NS + "cr":
+            parts.append("\n")
+        elif tag == W_NS + "noBreakHyphen":
+            parts.append("-")
+    return "".join(parts)
+
+
+def _paragraph_text(p) -> str:
+    # Mirrors python-docx: direct runs plus runs inside hyperlinks
+    parts = []
+    for child in p:
+        if child.tag == W_NS + "r":
+            parts.append(_run_text(child))
+        elif child.tag == W_NS + "hyperlink":
+            parts.extend(_run_text(r) for r in child.findall(W_NS + "r"))
+    return "".join(parts)
+
+
+def _paragraph_style_id(p):
+    p_pr = p.find(W_NS + "pPr")
+    if p_pr is None:
+        return None
+    p_style = p_pr.find(W_NS + "pStyle")
+    if p_style is None:
+        return None
+    return p_style.get(W_NS + "val")
+
+
+def iter_docx_paragraphs(file_path):
+    """
+    Stream (style_name, text) for every body-level paragraph of a .docx file.
+
+    Each top-level body element is discarded once read, so memory stays
+    flat regardless of document size.
+    """
+    with zipfile.ZipFile(file_path) as docx_zip:
+        style_names, default_name = load_paragraph_styles(docx_zip)
+
+        with docx_zip.open(DOCUMENT_XML) as f:
+            depth = 0
+            body = None
+
+            for event, elem in iterparse(f, events=("start", "end")):
+                if event == "start":
+                    depth += 1
+                    if depth == 2 and elem.tag == W_NS + "body":
+                        body = elem
+                    continue
+
+                depth -= 1
+
+                # Direct children of <w:body> only, like doc.paragraphs
+                if depth != 2 or body is None:
+                    continue
+
+                if elem.tag == W_NS + "p":
+                    style_id = _paragraph_style_id(elem)
+                    style_name = style_names.get(style_id, default_name)
+                    yield style_name, _paragraph_text(elem)
+
+                body.remove(elem)
+
+
+def iter_docx_sections(file_path):
+    """
+    Streaming variant of extract_docx_sections.
+
+    Yields the same {"feature", "sub_section", "content"} dicts one at a
+    time without building a python-docx Document.
+    """
+    yield from group_sections(iter_docx_paragraphs(file_path))
+
+
+# ================================
+# DOCX Extraction
+# ================================
+def extract_docx_sections(file_path: str, streaming: bool = False) -> dict:
     """
     Extract section-wise content from a .docx file.
 
+    streaming=True reads the XML parts directly (see iter_docx_sections)
+    instead of going through python-docx.
+
     Output Structure:
     {
         "document_name": "<file_path>",
@@ -20,52 +213,22 @@ def extract_docx_sections(file_path: str) -> dict:
     }
     """
 
-    doc = Document(file_path)
+    if streaming:
+        sections = list(iter_docx_sections(file_path))
+    else:
+        from docx import Document
 
-    data = {
+        doc = Document(file_path)
+        sections = list(group_sections(
+            (para.style.name if para.style else "", para.text)
+            for para in doc.paragraphs
+        ))
+
+    return {
         "document_name": str(file_path),
-        "sections": []
+        "sections": sections
     }
 
-    current_feature = None
-    current_subsection = None
-    buffer = []
-
-    def flush_section():
-        nonlocal buffer
-        if current_feature and buffer:
-            data["sections"].append({
-                "feature": current_feature,
-                "sub_section": current_subsection,
-                "content": buffer
-            })
-            buffer = []
-
-    for para in doc.paragraphs:
-        text = para.text.strip()
-        if not text:
-            continue
-
-        style_name = para.style.name if para.style else ""
-
-        if style_name == "Heading 1":
-            flush_section()
-            current_feature = text
-            current_subsection = None
-            buffer = []
-            continue
-
-        if style_name == "Heading 2":
-            flush_section()
-            current_subsection = text
-            buffer = []
-            continue
-
-        buffer.append(text)
-
-    flush_section()
-    return data
-
 
 # ---------------- CLI SUPPORT (OPTIONAL) ----------------
 if __name__ == "__main__":
@@ -78,7 +241,7 @@ if __name__ == "__main__":
     ssd_path = sys.argv[1]
     output_path = Path(ssd_path).stem + "_structured.json"
 
-    extracted_data = extract_docx_sections(ssd_path)
+    extracted_data = extract_docx_sections(ssd_path, streaming="--stream" in sys.argv)
 
     with open(output_path, "w", encoding="utf-8") as f:
         json.dump(extracted_data, f, indent=2, ensure_ascii=False)
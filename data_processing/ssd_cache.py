@@ -0,0 +1,107 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+
+from config import (
+    SSD_CACHE_DIR,
+    CLASSIFIER_MODEL,
+    EMBEDDING_BACKEND,
+    IMPORTANCE_THRESHOLD,
+    STREAMING_EXTRACTION,
+)
+from data_processing.raw_extraction import EXTRACTOR_VERSION, extract_docx_sections
+
+
+# ================================
+# Cache Keys
+# ================================
+def file_digest(path: Path, chunk_size: int = 1 << 20) -> str:
+    """SHA-256 of the file contents, read in chunks."""
+    digest = hashlib.sha256()
+    with Path(path).open("rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def cache_key(*parts) -> str:
+    payload = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def classifier_config() -> dict:
+    return {
+        "model": CLASSIFIER_MODEL,
+        "backend": EMBEDDING_BACKEND,
+        "importance_threshold": IMPORTANCE_THRESHOLD,
+    }
+
+
+# ================================
+# Storage
+# ================================
+def _entry_path(stage: str, key: str, cache_dir: Path) -> Path:
+    return Path(cache_dir) / stage / f"{key}.json"
+
+
+def load_cached(stage: str, key: str, cache_dir: Path = SSD_CACHE_DIR):
+    path = _entry_path(stage, key, cache_dir)
+    if not path.exists():
+        return None
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except json.JSONDecodeError:
+        print(f"Warning: ignoring corrupt cache entry {path}")
+        return None
+
+
+def store_cached(stage: str, key: str, data, cache_dir: Path = SSD_CACHE_DIR):
+    path = _entry_path(stage, key, cache_dir)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    # Write then rename so an interrupted run never leaves a half entry
+    tmp_path = path.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+# ================================
+# Cached Extraction + Classification
+# ================================
+def process_ssd(docx_path: Path, cache_dir: Path = SSD_CACHE_DIR):
+    """
+    Extract and classify an SSD, reusing cached results when possible.
+
+    Extraction is keyed by (DOCX content hash, extractor version);
+    classification additionally by the classifier config. Any change to
+    the document invalidates both stages.
+
+    Returns (raw_ssd_data, classified_data, cache_hit).
+    """
+    docx_hash = file_digest(docx_path)
+
+    extract_key = cache_key(docx_hash, EXTRACTOR_VERSION)
+    classify_key = cache_key(extract_key, classifier_config())
+
+    classified = load_cached("classified", classify_key, cache_dir)
+    raw_ssd_data = load_cached("extracted", extract_key, cache_dir)
+
+    if classified is not None and raw_ssd_data is not None:
+        print("SSD unchanged, using cached extraction and classification.")
+        return raw_ssd_data, classified, True
+
+    if raw_ssd_data is None:
+        print("Extracting SSD document...")
+        raw_ssd_data = extract_docx_sections(docx_path, streaming=STREAMING_EXTRACTION)
+        store_cached("extracted", extract_key, raw_ssd_data, cache_dir)
+
+    if classified is None:
+        # Imported lazily: loading the classifier model is the slow part
+        from data_processing.data_classification import aggregate_important_requirements
+
+        print("Classifying important requirements...")
+        classified = aggregate_important_requirements(raw_ssd_data)
+        store_cached("classified", classify_key, classified, cache_dir)
+
+    return raw_ssd_data, classified, False
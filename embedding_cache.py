@@ -0,0 +1,260 @@
+import hashlib
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+from config import (
+    EMBEDDING_MODEL,
+    EMBEDDING_CACHE_ENABLED,
+    EMBEDDING_CACHE_DIR,
+    EMBEDDING_CACHE_MAX_ENTRIES,
+)
+from model_registry import get_embedder, model_cache_id
+
+
+# SQLite caps the number of bound parameters per statement
+_SQL_CHUNK = 500
+
+
+def normalize_text(text: str) -> str:
+    return " ".join(text.split())
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha1(normalize_text(text).encode("utf-8")).hexdigest()
+
+
+def _chunks(items, size=_SQL_CHUNK):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+# ================================
+# Persistent Embedding Store
+# ================================
+class EmbeddingCache:
+    """
+    On-disk embedding store keyed by (model name, normalized text hash).
+
+    A SQLite index maps each key to a row of a memory-mapped float16 matrix
+    (one matrix per model). Once a model holds `max_entries` rows, the least
+    recently used rows are overwritten in place.
+    """
+
+    def __init__(self, cache_dir: Path = EMBEDDING_CACHE_DIR, max_entries: int = EMBEDDING_CACHE_MAX_ENTRIES):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+
+        self._lock = threading.Lock()
+        self._matrices = {}
+        self._conn = sqlite3.connect(self.cache_dir / "index.sqlite", check_same_thread=False)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS models (
+                model TEXT PRIMARY KEY,
+                dim INTEGER NOT NULL,
+                capacity INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS entries (
+                model TEXT NOT NULL,
+                text_hash TEXT NOT NULL,
+                slot INTEGER NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (model, text_hash)
+            );
+            CREATE INDEX IF NOT EXISTS entries_lru ON entries (model, last_used);
+        """)
+        self._conn.commit()
+
+    def _matrix_path(self, model_name: str) -> Path:
+        slug = re.sub(r"[^A-Za-z0-9_.-]+", "_", model_name)
+        return self.cache_dir / f"{slug}.f16"
+
+    def _matrix(self, model_name: str, dim: int | None = None):
+        if model_name in self._matrices:
+            return self._matrices[model_name]
+
+        path = self._matrix_path(model_name)
+        row = self._conn.execute(
+            "SELECT dim, capacity FROM models WHERE model = ?", (model_name,)
+        ).fetchone()
+
+        if row is not None and not path.exists():
+            # Matrix file was removed; its index rows point at nothing
+            self._conn.execute("DELETE FROM entries WHERE model = ?", (model_name,))
+            self._conn.execute("DELETE FROM models WHERE model = ?", (model_name,))
+            self._conn.commit()
+            row = None
+
+        if row is None:
+            if dim is None:
+                return None
+            capacity = self.max_entries
+            self._conn.execute(
+                "INSERT INTO models (model, dim, capacity) VALUES (?, ?, ?)",
+                (model_name, dim, capacity),
+            )
+            self._conn.commit()
+        else:
+            dim, capacity = row
+
+        mode = "r+" if path.exists() else "w+"
+        matrix = np.memmap(path, dtype=np.float16, mode=mode, shape=(capacity, dim))
+        self._matrices[model_name] = matrix
+        return matrix
+
+    def get_many(self, model_name: str, texts):
+        """Cached vectors aligned with `texts`; None where the text is not cached."""
+        hashes = [text_hash(t) for t in texts]
+
+        with self._lock:
+            matrix = self._matrix(model_name)
+            if matrix is None:
+                return [None] * len(texts)
+
+            slots = {}
+            for chunk in _chunks(list(set(hashes))):
+                placeholders = ",".join("?" * len(chunk))
+                slots.update(self._conn.execute(
+                    f"SELECT text_hash, slot FROM entries "
+                    f"WHERE model = ? AND text_hash IN ({placeholders})",
+                    (model_name, *chunk),
+                ).fetchall())
+
+            if slots:
+                now = time.time()
+                self._conn.executemany(
+                    "UPDATE entries SET last_used = ? WHERE model = ? AND text_hash = ?",
+                    [(now, model_name, h) for h in slots],
+                )
+                self._conn.commit()
+
+            return [
+                np.array(matrix[slots[h]], dtype=np.float32) if h in slots else None
+                for h in hashes
+            ]
+
+    def put_many(self, model_name: str, texts, vectors):
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if not len(texts):
+            return
+
+        with self._lock:
+            matrix = self._matrix(model_name, dim=vectors.shape[1])
+            capacity = matrix.shape[0]
+
+            new_items = {}
+            for text, vector in zip(texts, vectors):
+                new_items[text_hash(text)] = vector
+
+            for chunk in _chunks(list(new_items)):
+                placeholders = ",".join("?" * len(chunk))
+                for (h,) in self._conn.execute(
+                    f"SELECT text_hash FROM entries "
+                    f"WHERE model = ? AND text_hash IN ({placeholders})",
+                    (model_name, *chunk),
+                ):
+                    new_items.pop(h, None)
+
+            # A batch larger than the cache keeps only its tail
+            items = list(new_items.items())[-capacity:]
+            if not items:
+                return
+
+            used = self._conn.execute(
+                "SELECT COUNT(*) FROM entries WHERE model = ?", (model_name,)
+            ).fetchone()[0]
+            fresh = min(len(items), capacity - used)
+            evicted = [
+                slot for (slot,) in self._conn.execute(
+                    "SELECT slot FROM entries WHERE model = ? ORDER BY last_used LIMIT ?",
+                    (model_name, len(items) - fresh),
+                )
+            ]
+            if evicted:
+                self._conn.executemany(
+                    "DELETE FROM entries WHERE model = ? AND slot = ?",
+                    [(model_name, slot) for slot in evicted],
+                )
+
+            slots = list(range(used, used + fresh)) + evicted
+            for slot, (_, vector) in zip(slots, items):
+                matrix[slot] = vector
+            matrix.flush()
+
+            now = time.time()
+            self._conn.executemany(
+                "INSERT INTO entries (model, text_hash, slot, last_used) VALUES (?, ?, ?, ?)",
+                [(model_name, h, slot, now) for slot, (h, _) in zip(slots, items)],
+            )
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            for matrix in self._matrices.values():
+                matrix.flush()
+            self._matrices.clear()
+            self._conn.close()
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_embedding_cache() -> EmbeddingCache:
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = EmbeddingCache()
+    return _cache
+
+
+# ================================
+# Cached Encoding (PUBLIC API)
+# ================================
+def embed_texts(texts, model_name: str = EMBEDDING_MODEL):
+    """
+    Normalized float32 embeddings for `texts`, consulting the on-disk cache
+    first. The model is only loaded when at least one text is missing.
+    """
+    texts = list(texts)
+    cache_id = model_cache_id("embedder", model_name)
+
+    if not EMBEDDING_CACHE_ENABLED:
+        return get_embedder(model_name).encode(
+            texts,
+            convert_to_numpy=True,
+            normalize_embeddings=True
+        )
+
+    cache = get_embedding_cache()
+    vectors = cache.get_many(cache_id, texts)
+    missing_idx = [i for i, v in enumerate(vectors) if v is None]
+
+    if missing_idx:
+        missing_texts = [texts[i] for i in missing_idx]
+        fresh = get_embedder(model_name).encode(
+            missing_texts,
+            convert_to_numpy=True,
+            normalize_embeddings=True
+        )
+        cache.put_many(cache_id, missing_texts, fresh)
+        # Same float16 round trip as the stored copy, so a cold run returns
+        # exactly what a warm run will read back
+        fresh = np.asarray(fresh).astype(np.float16).astype(np.float32)
+        for i, vector in zip(missing_idx, fresh):
+            vectors[i] = vector
+
+    if not vectors:
+        return np.zeros((0, 0), dtype=np.float32)
+
+    embeddings = np.vstack(vectors).astype(np.float32)
+
+    # float16 storage loses a little precision; restore unit length
+    norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return embeddings / norms
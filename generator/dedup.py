@@ -0,0 +1,138 @@
+from config import EMBEDDING_MODEL, DEDUP_THRESHOLD, DEDUP_RETRIEVAL_MODE, DEDUP_BLOCK_SIZE
+
+
+def _clean(text: str) -> str:
+    return text.lstrip("0123456789. ")
+
+
+# ================================
+# Growing Search Index
+# ================================
+class _NearestIndex:
+    """
+    Testcase embeddings searched with a validator retrieval `mode`, each
+    tagged with its owner. Rows are added as they are kept; an IVF index
+    is re-clustered whenever it has doubled since it was last built.
+    """
+
+    def __init__(self, mode, threshold):
+        self.mode = mode
+        self.threshold = threshold
+        self.owners = []
+        self.embeddings = None
+        self._ivf = None
+        self._clustered = 0
+
+    def add(self, emb, owners):
+        import numpy as np
+
+        from validator.retrieval import IVFIndex
+
+        if not len(emb):
+            return
+        self.owners.extend(owners)
+        self.embeddings = emb if self.embeddings is None else np.concatenate([self.embeddings, emb])
+
+        if self.mode != "ivf":
+            return
+        if self._ivf is None or len(self.owners) >= 2 * self._clustered:
+            self._ivf = IVFIndex().build(self.embeddings)
+            self._clustered = len(self.owners)
+        else:
+            self._ivf.add(emb)
+
+    def nearest(self, emb):
+        """{query index: (owner, similarity)} for queries with a match at or above threshold."""
+        from validator.retrieval import find_candidates
+
+        if self.embeddings is None:
+            return {}
+        if self.mode == "ivf":
+            query_idx, owner_idx, sims = self._ivf.search(emb, self.threshold, k=1)
+        else:
+            query_idx, owner_idx, sims = find_candidates(
+                emb, self.embeddings, self.threshold, mode=self.mode, k=1
+            )
+
+        best = {}
+        for i, j, sim in zip(query_idx, owner_idx, sims):
+            if sim > best.get(int(i), (None, -1.0))[1]:
+                best[int(i)] = (self.owners[j], float(sim))
+        return best
+
+
+# ================================
+# Embedding-based Near-duplicate Filter
+# ================================
+def dedupe_new_testcases(
+    new_rows,
+    existing_rows,
+    threshold: float = DEDUP_THRESHOLD,
+    mode: str = DEDUP_RETRIEVAL_MODE,
+    block_size: int = DEDUP_BLOCK_SIZE,
+):
+    """
+    Drop new testcases that say the same thing as one already in the suite.
+
+    new_rows are (type, text, section, requirement hashes) tuples, existing_rows
+    are testcase store rows. Each block of new rows is searched in one index
+    (`mode`) holding the existing testcases and the new rows kept so far,
+    then checked against itself, so the work does not grow with new x new.
+
+    Returns (kept rows, merges) where merges maps an existing testcase id
+    to the requirement hashes of the new rows it absorbed.
+    """
+    import numpy as np
+
+    from embedding_cache import embed_texts
+
+    if not new_rows:
+        return [], {}
+
+    new_emb = embed_texts([_clean(row[1]) for row in new_rows], EMBEDDING_MODEL)
+
+    index = _NearestIndex(mode, threshold)
+    if existing_rows:
+        index.add(
+            embed_texts([row["text"] for row in existing_rows], EMBEDDING_MODEL),
+            [("existing", row["id"]) for row in existing_rows],
+        )
+
+    merges = {}
+    kept = []        # indices into new_rows
+    kept_links = {}  # index -> requirement hashes (grows as later rows merge in)
+
+    for start in range(0, len(new_rows), block_size):
+        block = new_emb[start:start + block_size]
+        best = index.nearest(block)
+        block_sims = block @ block.T
+        block_kept = []
+
+        for b in range(len(block)):
+            owner, sim = best.get(b, (None, -1.0))
+
+            # -------- Against rows kept earlier in this block --------
+            if block_kept:
+                sims = block_sims[b, block_kept]
+                top = int(np.argmax(sims))
+                if sims[top] >= threshold and sims[top] > sim:
+                    owner = ("new", start + block_kept[top])
+
+            requirements = new_rows[start + b][3]
+            if owner is None:
+                block_kept.append(b)
+                kept.append(start + b)
+                kept_links[start + b] = list(requirements)
+                continue
+
+            source, key = owner
+            links = merges.setdefault(key, []) if source == "existing" else kept_links[key]
+            links.extend(h for h in requirements if h not in links)
+
+        index.add(block[block_kept], [("new", start + b) for b in block_kept])
+
+    kept_rows = [
+        (new_rows[i][0], new_rows[i][1], new_rows[i][2], kept_links[i])
+        for i in kept
+    ]
+    return kept_rows, merges
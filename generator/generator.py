@@ -1,19 +1,46 @@
 # generator/generator.py
 
+import asyncio
 import json
 import os
 import hashlib
+import math
+import threading
+import time
 from pathlib import Path
-from langchain_community.chat_models import ChatOllama
-from langchain_core.prompts import ChatPromptTemplate
-from langgraph.graph import StateGraph, END
-from config import FORCE_REGENERATE
+from testcase_store import TestcaseStore, testcase_store_file
+from config import (
+    FORCE_REGENERATE,
+    GENERATION_CONCURRENCY,
+    GENERATION_OUTPUT_TOKENS,
+    LLM_CONTEXT_TOKENS,
+    LLM_BACKEND,
+    LLM_MAX_RETRIES,
+    LLM_RETRY_BACKOFF_S,
+    LLM_CACHE_ENABLED,
+    STREAMING_GENERATION,
+    DEDUP_ENABLED,
+)
 
 
-# LLM (UNCHANGED)
+# LLM backend (created on first use so importing this module stays cheap)
 
-print("Loading model...")
-llm = ChatOllama(model="mistral", temperature=0.2, streaming=False)
+_llm_backend = None
+
+
+def get_llm_backend():
+    global _llm_backend
+    if _llm_backend is None:
+        from generator.llm_backends import create_backend
+
+        _llm_backend = create_backend(LLM_BACKEND)
+    return _llm_backend
+
+
+def set_llm_backend(backend):
+    """Use `backend` (an llm_backends.LLMBackend) for all later generation."""
+    global _llm_backend
+    _llm_backend = backend
 
 # Utility Functions (UNCHANGED)
 def load_json(path: Path):
@@ -42,31 +69,156 @@ def load_hash(path: Path):
 def save_hash(path: Path, hash_value):
     path.write_text(hash_value, encoding="utf-8")
 
+# Per-section / per-requirement fingerprints
+def requirement_hash(text: str):
+    return hashlib.md5(text.encode("utf-8")).hexdigest()
+
+def fingerprint_file(output_testcase_file: Path):
+    """Fingerprints live next to the testcases: testcases.txt -> testcases.sections.json"""
+    return output_testcase_file.with_name(output_testcase_file.stem + ".sections.json")
+
+# Token-budgeted chunking
+def estimate_tokens(text: str):
+    """Local estimate for Mistral's tokenizer: ~4 characters or ~0.75 words per token."""
+    return max(math.ceil(len(text) / 4), math.ceil(len(text.split()) * 4 / 3))
+
+def chunk_budget(context_tokens: int = LLM_CONTEXT_TOKENS, output_tokens: int = GENERATION_OUTPUT_TOKENS):
+    """Requirement tokens per prompt: the context window minus the template and the output reserve."""
+    budget = context_tokens - estimate_tokens(PROMPT_TEMPLATE) - output_tokens
+    if budget <= 0:
+        raise ValueError(
+            f"LLM_CONTEXT_TOKENS={context_tokens} leaves no room for requirements after the "
+            f"prompt template and GENERATION_OUTPUT_TOKENS={output_tokens}"
+        )
+    return budget
+
+def chunk_requirements(requirements, budget: int | None = None):
+    """
+    Split a section's requirements, in order, into batches whose joined
+    text stays within `budget` estimated tokens (default: chunk_budget()).
+    A single requirement over the budget gets a batch of its own.
+    """
+    if budget is None:
+        budget = chunk_budget()
+    chunks, current, used = [], [], 0
+    for req in requirements:
+        tokens = estimate_tokens(req) + 1   # + joining newline
+        if current and used + tokens > budget:
+            chunks.append(current)
+            current, used = [], 0
+        current.append(req)
+        used += tokens
+    if current:
+        chunks.append(current)
+    return chunks
+
+def output_links(record):
+    """Requirement hashes behind each stored output (older records only kept the section's)."""
+    links = record.get("output_requirements")
+    if links is None or len(links) != len(record["outputs"]):
+        links = [record["requirements"]] * len(record["outputs"])
+    return links
+
+def testcase_rows(section, output, requirement_hashes):
+    """(type, testcase, section, requirement hashes) rows for the testcase store."""
+    split = hepler(output)
+    return [(kind, tc, section, requirement_hashes) for kind in split for tc in split[kind]]
+
+def dedupe_rows(store: TestcaseStore, rows, existing_rows):
+    """Drop near-duplicate rows; their requirements are linked to the testcase they repeat."""
+    from generator.dedup import dedupe_new_testcases
+
+    kept, merges = dedupe_new_testcases(rows, existing_rows)
+    for testcase_id, requirements in merges.items():
+        store.merge_requirements(testcase_id, requirements)
+    print(f"De-duplication: dropped {len(rows) - len(kept)} of {len(rows)} new test cases")
+    return kept
+
+def stream_file(output_testcase_file: Path):
+    """Live feed of the current run: testcases.txt -> testcases.stream.jsonl"""
+    return output_testcase_file.with_name(output_testcase_file.stem + ".stream.jsonl")
+
 def hepler(text):
-    sections = {"Positive": [], "Negative": [], "Boundary": []}
-    current = None
-    for line in text.splitlines():
+    parser = TestcaseStreamParser()
+    parser.feed(text)
+    parser.close()
+    return parser.sections
+
+# Incremental parsing (stateful hepler)
+class TestcaseStreamParser:
+    """
+    hepler for text that arrives in pieces. feed() returns the
+    (type, testcase) items whose line has been completed so far.
+    """
+
+    def __init__(self):
+        self.sections = {"Positive": [], "Negative": [], "Boundary": []}
+        self.current = None
+        self._buffer = ""
+
+    def _parse_line(self, line):
         line = line.strip()
         if line.startswith("Positive"):
-            current = "Positive"
+            self.current = "Positive"
         elif line.startswith("Negative"):
-            current = "Negative"
+            self.current = "Negative"
         elif line.startswith("Boundary"):
-            current = "Boundary"
-        elif current and line:
-            sections[current].append(line)
-    return sections
+            self.current = "Boundary"
+        elif self.current and line:
+            self.sections[self.current].append(line)
+            return self.current, line
+        return None
+
+    def feed(self, text: str):
+        lines = (self._buffer + text).splitlines(keepends=True)
+        # Last line stays buffered until its line break arrives
+        self._buffer = ""
+        if lines and lines[-1].splitlines()[0] == lines[-1]:
+            self._buffer = lines.pop()
+        return [item for item in map(self._parse_line, lines) if item]
+
+    def close(self):
+        line, self._buffer = self._buffer, ""
+        item = self._parse_line(line)
+        return [item] if item else []
+
+class TestcaseStreamWriter:
+    """
+    Appends each parsed testcase to a JSONL file (flushed per line) and
+    hands it to `on_testcase(section, type, testcase)` if given.
+    """
+
+    def __init__(self, path: Path, on_testcase=None):
+        self.path = path
+        self.on_testcase = on_testcase
+        self.count = 0
+        self._lock = threading.Lock()
+        self._file = path.open("w", encoding="utf-8")
+
+    def publish(self, section, kind, testcase):
+        testcase = testcase.lstrip("0123456789. ")
+        record = {"section": section, "type": kind, "testcase": testcase}
+        with self._lock:
+            self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+            self._file.flush()
+            self.count += 1
+        if self.on_testcase:
+            self.on_testcase(section, kind, testcase)
+
+    def close(self):
+        with self._lock:
+            self._file.close()
 
 # Graph State (UNCHANGED)
 class State(dict):
     section: str
     text: str
     testcases: dict
+    use_cache: bool
+    publish: object
 
-# Generation Node (UNCHANGED)
-def generate_testcases_node(state: State):
-    print(f"Generating test cases for section: {state['section']}")
-    prompt = ChatPromptTemplate.from_template("""
+# Prompt
+PROMPT_TEMPLATE = """
 You are a Quality Assurance Engineer. Your task is to generate **comprehensive test cases** for the given requirements.
 
     Guidelines:
@@ -113,86 +265,372 @@ You are a Quality Assurance Engineer. Your task is to generate **comprehensive t
     
     Requirement:
     {input_text}
-""")
-    chain = prompt | llm
-    result = chain.invoke({"input_text": state["text"]})
-    print("Testcases++++++++++++++++",result)
-    state["testcases"][state["section"]] = result.content
+"""
+
+
+
+def build_prompt(text: str):
+    return PROMPT_TEMPLATE.format(input_text=text)
+
+
+# LLM Response Cache
+def cached_completion(state: State):
+    if not state.get("use_cache", LLM_CACHE_ENABLED):
+        return None
+
+    from generator.llm_cache import get_llm_cache
+
+    backend = get_llm_backend()
+    content = get_llm_cache().get(
+        backend.cache_id, backend.temperature, PROMPT_TEMPLATE, state["text"]
+    )
+    if content is not None:
+        print(f"Using cached test cases for section: {state['section']}")
+    return content
+
+
+def store_completion(state: State, content: str):
+    if not state.get("use_cache", LLM_CACHE_ENABLED):
+        return
+
+    from generator.llm_cache import get_llm_cache
+
+    backend = get_llm_backend()
+    get_llm_cache().put(
+        backend.cache_id, backend.temperature, PROMPT_TEMPLATE, state["text"], content
+    )
+
+
+# Streaming
+def publish_testcases(state: State, items):
+    for kind, testcase in items:
+        state["publish"](state["section"], kind, testcase)
+
+
+def publish_completion(state: State, content: str):
+    """Publish every testcase of an already complete (e.g. cached) output."""
+    parser = TestcaseStreamParser()
+    publish_testcases(state, parser.feed(content) + parser.close())
+
+
+# LLM Calls (streamed when the state carries a publisher)
+def complete(state: State, prompt: str):
+    backend = get_llm_backend()
+    if not state.get("publish"):
+        print(f"Generating test cases for section: {state['section']}")
+        return backend.generate(prompt)
+
+    print(f"Streaming test cases for section: {state['section']}")
+    parser = TestcaseStreamParser()
+    parts = []
+    for piece in backend.stream(prompt):
+        parts.append(piece)
+        publish_testcases(state, parser.feed(piece))
+    publish_testcases(state, parser.close())
+    return "".join(parts)
+
+
+async def acomplete(state: State, prompt: str):
+    backend = get_llm_backend()
+    if not state.get("publish"):
+        print(f"Generating test cases for section: {state['section']}")
+        return await backend.agenerate(prompt)
+
+    print(f"Streaming test cases for section: {state['section']}")
+    parser = TestcaseStreamParser()
+    parts = []
+    async for piece in backend.astream(prompt):
+        parts.append(piece)
+        publish_testcases(state, parser.feed(piece))
+    publish_testcases(state, parser.close())
+    return "".join(parts)
+
+
+def retry_delay(state: State, attempt: int, error: Exception):
+    """Seconds to wait before retrying a failed call; re-raises once retries run out."""
+    if attempt >= LLM_MAX_RETRIES:
+        raise error
+    print(f"LLM call failed for section {state['section']} ({error}); retrying...")
+    return LLM_RETRY_BACKOFF_S * 2 ** attempt
+
+
+# Generation Node (sync for invoke, async for ainvoke)
+# (a stream that fails midway is retried from the start, so the live
+# feed may repeat its first testcases; the stored output does not)
+def generate_testcases_node(state: State):
+    content = cached_completion(state)
+    if content is not None:
+        if state.get("publish"):
+            publish_completion(state, content)
+    else:
+        prompt = build_prompt(state["text"])
+        for attempt in range(LLM_MAX_RETRIES + 1):
+            try:
+                content = complete(state, prompt)
+                break
+            except Exception as e:
+                time.sleep(retry_delay(state, attempt, e))
+        store_completion(state, content)
+
+    state["testcases"][state["section"]] = content
     return state
 
-# LangGraph (UNCHANGED)
-graph = StateGraph(State)
-graph.add_node("generate", generate_testcases_node)
-graph.set_entry_point("generate")
-graph.add_edge("generate", END)
-app = graph.compile()
+
+async def agenerate_testcases_node(state: State):
+    content = cached_completion(state)
+    if content is not None:
+        if state.get("publish"):
+            publish_completion(state, content)
+    else:
+        prompt = build_prompt(state["text"])
+        for attempt in range(LLM_MAX_RETRIES + 1):
+            try:
+                content = await acomplete(state, prompt)
+                break
+            except Exception as e:
+                await asyncio.sleep(retry_delay(state, attempt, e))
+        store_completion(state, content)
+
+    state["testcases"][state["section"]] = content
+    return state
+
+# LangGraph (compiled on first use)
+_graph_app = None
+
+
+def get_graph_app():
+    global _graph_app
+    if _graph_app is None:
+        from langchain_core.runnables import RunnableLambda
+        from langgraph.graph import StateGraph, END
+
+        graph = StateGraph(State)
+        graph.add_node(
+            "generate",
+            RunnableLambda(generate_testcases_node, afunc=agenerate_testcases_node)
+        )
+        graph.set_entry_point("generate")
+        graph.add_edge("generate", END)
+        _graph_app = graph.compile()
+    return _graph_app
+
+# Concurrent Section Generation
+def _initial_state(section, text, use_cache, publish):
+    return {
+        "section": section,
+        "text": text,
+        "testcases": {},
+        "use_cache": use_cache,
+        "publish": publish
+    }
+
+
+async def _agenerate_sections(app, jobs, concurrency, use_cache, publish):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def generate(section, text):
+        async with semaphore:
+            result = await app.ainvoke(_initial_state(section, text, use_cache, publish))
+            return result["testcases"][section]
+
+    return await asyncio.gather(*(generate(section, text) for section, text in jobs))
+
+
+def generate_sections(
+    jobs,
+    concurrency: int = GENERATION_CONCURRENCY,
+    use_cache: bool = LLM_CACHE_ENABLED,
+    publish=None
+):
+    """
+    LLM output for each (section, text) job, in job order.
+
+    Up to `concurrency` sections are in flight at once, so wall time
+    tends towards the slowest section rather than the sum of all.
+    use_cache=False skips the LLM response cache in both directions.
+    With `publish`, completions are streamed and publish(section, type,
+    testcase) is called as soon as each testcase line is complete.
+    """
+    app = get_graph_app()
+
+    if concurrency <= 1 or len(jobs) <= 1:
+        return [
+            app.invoke(_initial_state(section, text, use_cache, publish))["testcases"][section]
+            for section, text in jobs
+        ]
+
+    return asyncio.run(_agenerate_sections(app, jobs, concurrency, use_cache, publish))
+
 
 # PUBLIC ENTRY FUNCTION (NEW)
 def run_generator(
     master_requirement_file: Path,
     new_requirement_file: Path | None,
     output_testcase_file: Path,
-    hash_file: Path
+    hash_file: Path,
+    use_cache: bool = LLM_CACHE_ENABLED,
+    streaming: bool = STREAMING_GENERATION,
+    on_testcase=None,
+    concurrency: int = GENERATION_CONCURRENCY
 ):
     """
     Called by app.py or CLI
+
+    With streaming (or an `on_testcase(section, type, testcase)` callback),
+    testcases are published as they are generated; testcases.txt is still
+    written once every section has finished.
     """
 
     stored_requirements = load_json(master_requirement_file)
     new_requirements = load_json(new_requirement_file) if new_requirement_file else {}
 
-    generate_master = not output_testcase_file.exists() or FORCE_REGENERATE
-    generate_new = bool(new_requirements)
+    # Per section: hashes of the requirements already covered and the LLM
+    # outputs that cover them, as of the last run
+    fingerprints_path = fingerprint_file(output_testcase_file)
+    fresh = (
+        FORCE_REGENERATE
+        or not output_testcase_file.exists()
+        or output_testcase_file.stat().st_size == 0
+    )
+    records = {}
+    if not fresh:
+        records = load_json(fingerprints_path).get("sections", {})
+
+    jobs = []        # (section, text) for generate_sections
+    job_meta = []    # (section, requirement hashes, replaces the section's outputs)
+    rewrite = False
+    tracked = True   # whether `records` describes the whole output file
+
+    def add_jobs(section, requirements, replace):
+        # One job per token-budgeted chunk; only the first may reset the section
+        for i, chunk in enumerate(chunk_requirements(requirements)):
+            jobs.append((section, "\n".join(chunk)))
+            job_meta.append((section, [requirement_hash(r) for r in chunk], replace and i == 0))
+
+    # --- Master: only new or changed sections ---
+    if fresh:
+        changed = list(stored_requirements)
+    elif not records:
+        # Output from before fingerprints existed: fall back to the whole-SSD hash
+        stored_hash = load_hash(hash_file)
+        if stored_hash is None or stored_hash == compute_hash(stored_requirements):
+            changed = []
+            tracked = False
+        else:
+            print("Requirements changed since last run (no section fingerprints yet).")
+            changed = list(stored_requirements)
+    else:
+        changed = []
+        for section, requirements in stored_requirements.items():
+            hashes = [requirement_hash(r) for r in requirements]
+            covered = set(records.get(section, {}).get("requirements", []))
+
+            if section not in records or not covered <= set(hashes):
+                changed.append(section)
+            elif covered != set(hashes):
+                # Requirements only added: generate for the additions alone
+                added = [r for r, h in zip(requirements, hashes) if h not in covered]
+                add_jobs(section, added, replace=False)
+
+        removed = [section for section in records if section not in stored_requirements]
+        for section in removed:
+            del records[section]
+        rewrite = bool(removed)
+
+    for section in changed:
+        add_jobs(section, stored_requirements[section], replace=True)
+
+    rewrite = rewrite or bool(jobs)
+    if rewrite:
+        sections = len({section for section, _ in jobs})
+        print(f"Sections to (re)generate: {sections} of {len(stored_requirements)} "
+              f"({len(jobs)} prompts)")
 
-    if not generate_master and not generate_new:
-        print("Nothing new to generate.")
-        return
+    # --- Missing only ---
+    for section, requirements in new_requirements.items():
+        add_jobs(section, requirements, replace=False)
 
-    all_testcases = {}
+    store = TestcaseStore(testcase_store_file(output_testcase_file))
+    if not fresh and not len(store) and store.max_id() == 0:
+        print(f"Importing {output_testcase_file} into the testcase store...")
+        store.import_txt(output_testcase_file)
 
-    # --- Master ---
-    if generate_master:
-        for section, requirements in stored_requirements.items():
-            combined_text = "\n".join(requirements)
-            result = app.invoke({
-                "section": section,
-                "text": combined_text,
-                "testcases": all_testcases
-            })
-            all_testcases.update(result["testcases"])
+    if not jobs and not rewrite:
+        print("Nothing new to generate.")
+        return
 
-    # --- Missing only ---
-    if generate_new:
-        for section, requirements in new_requirements.items():
-            combined_text = "\n".join(requirements)
-            result = app.invoke({
-                "section": section,
-                "text": combined_text,
-                "testcases": all_testcases
-            })
-            all_testcases.update(result["testcases"])
-
-            stored_requirements.setdefault(section, [])
-            for req in requirements:
-                if req not in stored_requirements[section]:
-                    stored_requirements[section].append(req)
-
-    merged = {"Positive": [], "Negative": [], "Boundary": []}
-    for section_output in all_testcases.values():
-        split = hepler(section_output)
-        for k in merged:
-            merged[k].extend(split[k])
-
-    mode = "w" if generate_master else "a"
-    with output_testcase_file.open(mode, encoding="utf-8") as f:
-        for section in ["Positive", "Negative", "Boundary"]:
-            f.write(f"{section}:\n")
-            for i, tc in enumerate(merged[section], 1):
-                f.write(f"{i}. {tc.lstrip('0123456789. ')}\n")
-            f.write("\n")
+    writer = None
+    if streaming or on_testcase:
+        writer = TestcaseStreamWriter(stream_file(output_testcase_file), on_testcase)
+
+    try:
+        outputs = generate_sections(
+            jobs,
+            concurrency=concurrency,
+            use_cache=use_cache,
+            publish=writer.publish if writer else None
+        )
+    finally:
+        if writer:
+            writer.close()
+            print(f"Streamed {writer.count} test cases to {writer.path}")
+
+    new_rows = []
+    for (section, hashes, replace), output in zip(job_meta, outputs):
+        record = records.get(section)
+        if replace or record is None:
+            record = records[section] = {"requirements": [], "outputs": [], "output_requirements": []}
+        record["requirements"].extend(h for h in hashes if h not in record["requirements"])
+        record["output_requirements"] = output_links(record) + [hashes]
+        record["outputs"].append(output)
+        if not replace:
+            new_rows.extend(testcase_rows(section, output, hashes))
+
+    for section, requirements in new_requirements.items():
+        stored_requirements.setdefault(section, [])
+        for req in requirements:
+            if req not in stored_requirements[section]:
+                stored_requirements[section].append(req)
+
+    # Repeats (chunks of one section often share generic testcases) are
+    # dropped by the store, which keys rows on normalized content
+    if rewrite:
+        # Regenerated sections are rebuilt from their new outputs. The others
+        # keep their stored rows as they are (ids, earlier de-duplication and
+        # merged requirement links) plus any rows generated for additions
+        replaced = {section for section, _, replace in job_meta if replace}
+        stored_rows = {}
+        for row in store.rows():
+            stored_rows.setdefault(row["section"], []).append(
+                (row["type"], row["text"], row["section"], row["requirements"])
+            )
+
+        rows = []
+        for section in stored_requirements:
+            if section not in records:
+                continue
+            if section in replaced or section not in stored_rows:
+                rows.extend(
+                    row
+                    for output, links in zip(records[section]["outputs"], output_links(records[section]))
+                    for row in testcase_rows(section, output, links)
+                )
+            else:
+                rows.extend(stored_rows[section])
+                rows.extend(row for row in new_rows if row[2] == section)
+        written = store.replace_all(rows)
+    else:
+        if DEDUP_ENABLED:
+            new_rows = dedupe_rows(store, new_rows, existing_rows=store.rows())
+        written = store.append(new_rows)
+
+    store.export_txt(output_testcase_file)
+    print(f"Testcase store: {written} written, {len(store)} active ({store.path})")
 
     save_json(master_requirement_file, stored_requirements)
     save_hash(hash_file, compute_hash(stored_requirements))
+    if tracked:
+        save_json(fingerprints_path, {"sections": records})
 
     if new_requirement_file:
         save_json(new_requirement_file, {})
@@ -0,0 +1,200 @@
+import asyncio
+import hashlib
+from abc import ABC, abstractmethod
+import random
+import re
+import time
+
+from config import (
+    LLM_BACKEND,
+    LLM_MODEL,
+    LLM_TEMPERATURE,
+    LLM_CONTEXT_TOKENS,
+    FAKE_LLM_LATENCY_S,
+    FAKE_LLM_TOKENS_PER_S,
+    FAKE_LLM_FAILURE_RATE,
+    FAKE_LLM_SEED,
+)
+
+
+class LLMBackendError(RuntimeError):
+    pass
+
+
+# ================================
+# Backend Interface
+# ================================
+class LLMBackend(ABC):
+    """
+    What generate_testcases_node needs from an LLM: a completion for a
+    fully formatted prompt, whole or as streamed text pieces, sync or async.
+
+    `cache_id` and `temperature` key the LLM response cache, so outputs of
+    different backends never mix.
+    """
+
+    cache_id = None
+    temperature = None
+
+    @abstractmethod
+    def generate(self, prompt: str) -> str:
+        ...
+
+    @abstractmethod
+    async def agenerate(self, prompt: str) -> str:
+        ...
+
+    def stream(self, prompt: str):
+        yield self.generate(prompt)
+
+    async def astream(self, prompt: str):
+        yield await self.agenerate(prompt)
+
+
+# ================================
+# Ollama (default)
+# ================================
+class OllamaBackend(LLMBackend):
+    def __init__(
+        self,
+        model: str = LLM_MODEL,
+        temperature: float = LLM_TEMPERATURE,
+        num_ctx: int = LLM_CONTEXT_TOKENS,
+    ):
+        from langchain_community.chat_models import ChatOllama
+
+        print("Loading model...")
+        self.cache_id = model
+        self.temperature = temperature
+        self.llm = ChatOllama(model=model, temperature=temperature, num_ctx=num_ctx, streaming=False)
+
+    def generate(self, prompt):
+        result = self.llm.invoke(prompt)
+        return result.content
+
+    async def agenerate(self, prompt):
+        result = await self.llm.ainvoke(prompt)
+        return result.content
+
+    def stream(self, prompt):
+        for chunk in self.llm.stream(prompt):
+            yield chunk.content
+
+    async def astream(self, prompt):
+        async for chunk in self.llm.astream(prompt):
+            yield chunk.content
+
+
+# ================================
+# Deterministic stand-in (benchmarks / CI)
+# ================================
+class FakeLLMBackend(LLMBackend):
+    """
+    Offline stand-in that answers in the Positive/Negative/Boundary format.
+
+    Output depends only on the prompt and seed. Each call waits
+    `latency_s` before the first token and then emits `tokens_per_s`
+    tokens per second; `failure_rate` of calls raise LLMBackendError
+    before producing anything (decided per prompt and attempt, so runs
+    are reproducible and retries can succeed).
+    """
+
+    def __init__(
+        self,
+        latency_s: float = FAKE_LLM_LATENCY_S,
+        tokens_per_s: float = FAKE_LLM_TOKENS_PER_S,
+        failure_rate: float = FAKE_LLM_FAILURE_RATE,
+        seed: int = FAKE_LLM_SEED,
+    ):
+        self.latency_s = latency_s
+        self.tokens_per_s = tokens_per_s
+        self.failure_rate = failure_rate
+        self.seed = seed
+        self.cache_id = f"fake-{seed}"
+        self.temperature = 0.0
+        self.calls = 0
+        self.failures = 0
+        self._attempts = {}
+
+    def _rng(self, prompt: str, salt: str = ""):
+        digest = hashlib.sha1(f"{self.seed}:{salt}:{prompt}".encode("utf-8")).hexdigest()
+        return random.Random(int(digest[:16], 16))
+
+    def _check_failure(self, prompt):
+        self.calls += 1
+        attempt = self._attempts.get(prompt, 0)
+        self._attempts[prompt] = attempt + 1
+        if self._rng(prompt, f"fail{attempt}").random() < self.failure_rate:
+            self.failures += 1
+            raise LLMBackendError("fake LLM backend: simulated failure")
+
+    def completion(self, prompt: str) -> str:
+        """The text this backend answers `prompt` with."""
+        text = prompt.rsplit("Requirement:", 1)[-1]
+        subjects = []
+        for line in text.splitlines():
+            words = re.findall(r"[\w'\-/]+", line)
+            if words:
+                subjects.append(" ".join(words[:12]))
+        subjects = subjects or ["the requirement"]
+
+        rng = self._rng(prompt)
+        positive = [f"Verify that {s} works as specified for valid input." for s in subjects]
+        negative = [f"Verify that the system rejects invalid or missing data for {s}." for s in subjects]
+        boundary = [f"Verify the behaviour of {s} at its minimum and maximum allowed values."
+                    for s in subjects if rng.random() < 0.6]
+
+        lines = []
+        for header, items in (("Positive", positive), ("Negative", negative), ("Boundary", boundary)):
+            lines.append(header)
+            lines.extend(f"   {i}. {item}" for i, item in enumerate(items, 1))
+            lines.append("")
+        return "\n".join(lines)
+
+    def _tokens(self, prompt):
+        return re.findall(r"\S+\s*|\s+", self.completion(prompt))
+
+    def _duration(self, tokens):
+        return len(tokens) / self.tokens_per_s if self.tokens_per_s else 0.0
+
+    def generate(self, prompt):
+        self._check_failure(prompt)
+        tokens = self._tokens(prompt)
+        time.sleep(self.latency_s + self._duration(tokens))
+        return "".join(tokens)
+
+    async def agenerate(self, prompt):
+        self._check_failure(prompt)
+        tokens = self._tokens(prompt)
+        await asyncio.sleep(self.latency_s + self._duration(tokens))
+        return "".join(tokens)
+
+    def stream(self, prompt):
+        self._check_failure(prompt)
+        time.sleep(self.latency_s)
+        for token in self._tokens(prompt):
+            if self.tokens_per_s:
+                time.sleep(1 / self.tokens_per_s)
+            yield token
+
+    async def astream(self, prompt):
+        self._check_failure(prompt)
+        await asyncio.sleep(self.latency_s)
+        for token in self._tokens(prompt):
+            if self.tokens_per_s:
+                await asyncio.sleep(1 / self.tokens_per_s)
+            yield token
+
+
+BACKENDS = {
+    "ollama": OllamaBackend,
+    "fake": FakeLLMBackend,
+}
+
+
+def create_backend(name: str = LLM_BACKEND) -> LLMBackend:
+    try:
+        backend = BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"Unknown LLM backend '{name}'. Use one of {list(BACKENDS)}") from None
+    return backend()
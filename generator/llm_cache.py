@@ -0,0 +1,130 @@
+import hashlib
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from config import LLM_CACHE_FILE, LLM_CACHE_MAX_ENTRIES, LLM_CACHE_MAX_MB
+
+
+def sha1(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+# ================================
+# Persistent LLM Response Cache
+# ================================
+class LLMResponseCache:
+    """
+    Completions keyed by (model, temperature, prompt template hash, section
+    text hash).
+
+    Re-running the generator on unchanged sections reads the earlier
+    completion instead of calling the LLM. Once the cache holds more than
+    `max_entries` completions or `max_mb` of text, the least recently
+    used ones are evicted.
+    """
+
+    def __init__(
+        self,
+        path: Path = LLM_CACHE_FILE,
+        max_entries: int = LLM_CACHE_MAX_ENTRIES,
+        max_mb: float = LLM_CACHE_MAX_MB,
+    ):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.max_bytes = int(max_mb * 1024 * 1024)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS completions (
+                model TEXT NOT NULL,
+                temperature REAL NOT NULL,
+                template_hash TEXT NOT NULL,
+                text_hash TEXT NOT NULL,
+                response TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (model, temperature, template_hash, text_hash)
+            );
+            CREATE INDEX IF NOT EXISTS completions_lru ON completions (last_used);
+        """)
+        self._conn.commit()
+
+    def get(self, model: str, temperature: float, template: str, text: str):
+        """Cached completion, or None."""
+        key = (model, float(temperature), sha1(template), sha1(text))
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response FROM completions WHERE model = ? AND temperature = ? "
+                "AND template_hash = ? AND text_hash = ?",
+                key,
+            ).fetchone()
+            if row is None:
+                return None
+
+            self._conn.execute(
+                "UPDATE completions SET last_used = ? WHERE model = ? AND temperature = ? "
+                "AND template_hash = ? AND text_hash = ?",
+                (time.time(), *key),
+            )
+            self._conn.commit()
+            return row[0]
+
+    def put(self, model: str, temperature: float, template: str, text: str, response: str):
+        size = len(response.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO completions "
+                "(model, temperature, template_hash, text_hash, response, size, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (model, float(temperature), sha1(template), sha1(text), response, size, time.time()),
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        count, total = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM completions"
+        ).fetchone()
+        if count <= self.max_entries and total <= self.max_bytes:
+            return
+
+        doomed = []
+        for rowid, size in self._conn.execute(
+            "SELECT rowid, size FROM completions ORDER BY last_used"
+        ):
+            if count <= self.max_entries and total <= self.max_bytes:
+                break
+            doomed.append((rowid,))
+            count -= 1
+            total -= size
+
+        self._conn.executemany("DELETE FROM completions WHERE rowid = ?", doomed)
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM completions")
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> LLMResponseCache:
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = LLMResponseCache()
+    return _cache
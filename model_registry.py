@@ -0,0 +1,167 @@
+import gc
+import re
+import threading
+from pathlib import Path
+
+from config import (
+    EMBEDDING_MODEL,
+    NLI_MODEL,
+    EMBEDDING_BACKEND,
+    NLI_BACKEND,
+    ONNX_QUANTIZATION_CONFIG,
+    MODEL_EXPORT_DIR,
+)
+
+
+# ================================
+# Process-wide Model Registry
+# ================================
+# Models are loaded on first use and shared by every module that asks for
+# the same (kind, name, backend), so the classifier and validator reuse one
+# embedder.
+
+BACKENDS = ("torch", "torch-int8", "onnx", "onnx-int8")
+
+# Backend used when a caller does not ask for one explicitly
+DEFAULT_BACKENDS = {
+    "embedder": EMBEDDING_BACKEND,
+    "cross_encoder": NLI_BACKEND,
+}
+
+_models = {}
+_lock = threading.Lock()
+
+
+def _model_class(kind: str):
+    if kind == "embedder":
+        from sentence_transformers import SentenceTransformer
+        return SentenceTransformer
+
+    if kind == "cross_encoder":
+        from sentence_transformers import CrossEncoder
+        return CrossEncoder
+
+    raise ValueError(f"Unknown model kind: {kind}")
+
+
+def model_cache_id(kind: str, name: str, backend: str | None = None) -> str:
+    """
+    Identifier for keying cached model outputs (embeddings, NLI scores).
+
+    Non-default backends produce slightly different numbers, so they get
+    their own cache namespace.
+    """
+    backend = backend or DEFAULT_BACKENDS[kind]
+    return name if backend == "torch" else f"{name}#{backend}"
+
+
+# ================================
+# ONNX Export (one-time, cached on disk)
+# ================================
+def export_dir(name: str) -> Path:
+    slug = re.sub(r"[^A-Za-z0-9_.-]+", "_", name)
+    return Path(MODEL_EXPORT_DIR) / f"{slug}-onnx"
+
+
+def quantized_file_name() -> str:
+    return f"onnx/model_qint8_{ONNX_QUANTIZATION_CONFIG}.onnx"
+
+
+def export_model(kind: str, name: str, backend: str) -> Path:
+    """
+    Export `name` to ONNX under MODEL_EXPORT_DIR (and its dynamic int8
+    variant for "onnx-int8"). Later loads reuse the exported files.
+    """
+    cls = _model_class(kind)
+    path = export_dir(name)
+
+    if not any(path.glob("**/*.onnx")):
+        print(f"Exporting {name} to ONNX at {path} (one-time)...")
+        cls(name, backend="onnx").save_pretrained(str(path))
+
+    if backend == "onnx-int8" and not (path / quantized_file_name()).exists():
+        from sentence_transformers import export_dynamic_quantized_onnx_model
+
+        print(f"Quantizing {name} to int8 ({ONNX_QUANTIZATION_CONFIG}, one-time)...")
+        export_dynamic_quantized_onnx_model(
+            cls(str(path), backend="onnx"),
+            ONNX_QUANTIZATION_CONFIG,
+            str(path),
+        )
+
+    return path
+
+
+def _load(kind: str, name: str, backend: str):
+    cls = _model_class(kind)
+
+    if backend == "torch":
+        return cls(name)
+
+    if backend == "torch-int8":
+        import torch
+
+        model = cls(name, device="cpu")
+        module = model if kind == "embedder" else model.model
+        torch.quantization.quantize_dynamic(
+            module, {torch.nn.Linear}, dtype=torch.qint8, inplace=True
+        )
+        return model
+
+    if backend in ("onnx", "onnx-int8"):
+        path = export_model(kind, name, backend)
+        kwargs = {}
+        if backend == "onnx-int8":
+            kwargs["model_kwargs"] = {"file_name": quantized_file_name()}
+        return cls(str(path), backend="onnx", **kwargs)
+
+    raise ValueError(f"Unknown inference backend '{backend}'. Use one of {BACKENDS}")
+
+
+def get_model(kind: str, name: str, backend: str | None = None):
+    backend = backend or DEFAULT_BACKENDS[kind]
+    key = (kind, name, backend)
+    model = _models.get(key)
+    if model is not None:
+        return model
+
+    with _lock:
+        model = _models.get(key)
+        if model is None:
+            print(f"Loading {kind} model: {name} ({backend})")
+            model = _load(kind, name, backend)
+            _models[key] = model
+    return model
+
+
+def get_embedder(name: str = EMBEDDING_MODEL, backend: str | None = None):
+    return get_model("embedder", name, backend)
+
+
+def get_cross_encoder(name: str = NLI_MODEL, backend: str | None = None):
+    return get_model("cross_encoder", name, backend)
+
+
+def loaded_models():
+    return list(_models)
+
+
+def unload_models(name: str | None = None):
+    """Drop cached models (all of them, or only those matching `name`)."""
+    with _lock:
+        for key in list(_models):
+            if name is None or key[1] == name:
+                del _models[key]
+
+    gc.collect()
+
+
+# ---------------- CLI SUPPORT ----------------
+if __name__ == "__main__":
+    # One-time export of the configured models, e.g. during image build
+    for kind, name in (("embedder", EMBEDDING_MODEL), ("cross_encoder", NLI_MODEL)):
+        backend = DEFAULT_BACKENDS[kind]
+        if backend.startswith("onnx"):
+            print(f"{name}: {export_model(kind, name, backend)}")
+        else:
+            print(f"{name}: backend '{backend}' needs no export")
@@ -0,0 +1,264 @@
+import hashlib
+import json
+import sqlite3
+import threading
+from pathlib import Path
+
+
+TESTCASE_TYPES = ("Positive", "Negative", "Boundary")
+
+
+def testcase_store_file(output_testcase_file: Path) -> Path:
+    """The store lives next to its export: testcases.txt -> testcases.sqlite"""
+    return Path(output_testcase_file).with_suffix(".sqlite")
+
+
+def testcase_key(text: str) -> str:
+    """Content hash, ignoring numbering, case and spacing."""
+    normalized = " ".join(text.lstrip("0123456789. ").casefold().split())
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()
+
+
+# ================================
+# Structured Testcase Store
+# ================================
+class TestcaseStore:
+    """
+    Generated testcases in SQLite, one row per testcase.
+
+    Rows keep their id for as long as their content exists, and record the
+    requirement section and requirement hashes they were generated for,
+    their type and a content hash. testcases.txt is an export of the active
+    rows: one Positive/Negative/Boundary block per generation batch.
+
+    `revision` only changes when rows are replaced or removed, so a reader
+    that saw (revision, max id) earlier can fetch just the rows added since.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS testcases (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                content_hash TEXT NOT NULL UNIQUE,
+                type TEXT NOT NULL,
+                text TEXT NOT NULL,
+                section TEXT,
+                requirements TEXT NOT NULL,
+                batch INTEGER NOT NULL,
+                position INTEGER NOT NULL,
+                active INTEGER NOT NULL DEFAULT 1
+            );
+            CREATE INDEX IF NOT EXISTS testcases_layout ON testcases (active, batch, type, position);
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value INTEGER NOT NULL
+            );
+            INSERT OR IGNORE INTO meta (key, value) VALUES ('revision', 0);
+        """)
+        self._conn.commit()
+
+    # ---------------- state ----------------
+    def revision(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT value FROM meta WHERE key = 'revision'").fetchone()[0]
+
+    def max_id(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COALESCE(MAX(id), 0) FROM testcases").fetchone()[0]
+
+    def state(self):
+        """(revision, max id) snapshot for later `texts(since_id=...)` calls."""
+        return self.revision(), self.max_id()
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM testcases WHERE active = 1").fetchone()[0]
+
+    # ---------------- writes ----------------
+    def _next_batch(self):
+        return self._conn.execute("SELECT COALESCE(MAX(batch), 0) + 1 FROM testcases").fetchone()[0]
+
+    def _bump_revision(self):
+        self._conn.execute("UPDATE meta SET value = value + 1 WHERE key = 'revision'")
+
+    def _write(self, rows, batch, skip_active=False):
+        """
+        Insert or revive `rows` into `batch`; returns (written, revived existing rows).
+        skip_active leaves rows whose content is already active untouched.
+        """
+        positions = dict.fromkeys(TESTCASE_TYPES, 0)
+        seen = set()
+        written = revived = 0
+
+        for kind, text, section, requirements in rows:
+            text = text.lstrip("0123456789. ")
+            key = testcase_key(text)
+            if key in seen:
+                continue
+            seen.add(key)
+
+            existing = self._conn.execute(
+                "SELECT id, active FROM testcases WHERE content_hash = ?", (key,)
+            ).fetchone()
+            if skip_active and existing is not None and existing[1]:
+                continue
+
+            positions[kind] += 1
+            if existing is None:
+                self._conn.execute(
+                    "INSERT INTO testcases "
+                    "(content_hash, type, text, section, requirements, batch, position) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (key, kind, text, section, json.dumps(requirements), batch, positions[kind]),
+                )
+            else:
+                self._conn.execute(
+                    "UPDATE testcases SET type = ?, text = ?, section = ?, requirements = ?, "
+                    "batch = ?, position = ?, active = 1 WHERE id = ?",
+                    (kind, text, section, json.dumps(requirements), batch, positions[kind], existing[0]),
+                )
+                revived += 1
+            written += 1
+
+        return written, revived
+
+    def append(self, rows):
+        """
+        Add (type, text, section, requirement hashes) rows as a new batch.
+        Rows whose content is already active are skipped.
+        """
+        with self._lock:
+            written, revived = self._write(rows, self._next_batch(), skip_active=True)
+            if revived:
+                # Revived rows keep old ids, so "added since" no longer covers them
+                self._bump_revision()
+            self._conn.commit()
+        return written
+
+    def replace_all(self, rows):
+        """
+        Make `rows` the complete set of active testcases, as one batch.
+        Testcases that survive keep their ids; the rest are deactivated.
+        """
+        with self._lock:
+            self._conn.execute("UPDATE testcases SET active = 0")
+            written, _ = self._write(rows, self._next_batch())
+            self._bump_revision()
+            self._conn.commit()
+        return written
+
+    def merge_requirements(self, testcase_id: int, requirements):
+        """Link more requirement hashes to an existing testcase."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT requirements FROM testcases WHERE id = ?", (testcase_id,)
+            ).fetchone()
+            if row is None:
+                return
+            linked = json.loads(row[0])
+            linked.extend(h for h in requirements if h not in linked)
+            self._conn.execute(
+                "UPDATE testcases SET requirements = ? WHERE id = ?",
+                (json.dumps(linked), testcase_id),
+            )
+            self._conn.commit()
+
+    # ---------------- reads ----------------
+    def rows(self, since_id: int = 0, section: str | None = None, kind: str | None = None):
+        """Active rows as dicts, in export order."""
+        query = (
+            "SELECT id, type, text, section, requirements, batch, content_hash "
+            "FROM testcases WHERE active = 1 AND id > ?"
+        )
+        params = [since_id]
+        if section is not None:
+            query += " AND section = ?"
+            params.append(section)
+        if kind is not None:
+            query += " AND type = ?"
+            params.append(kind)
+        query += (
+            " ORDER BY batch, CASE type WHEN 'Positive' THEN 0 WHEN 'Negative' THEN 1 ELSE 2 END,"
+            " position"
+        )
+
+        with self._lock:
+            return [
+                {
+                    "id": row[0],
+                    "type": row[1],
+                    "text": row[2],
+                    "section": row[3],
+                    "requirements": json.loads(row[4]),
+                    "batch": row[5],
+                    "content_hash": row[6],
+                }
+                for row in self._conn.execute(query, params)
+            ]
+
+    def texts(self, since_id: int = 0):
+        return [row["text"] for row in self.rows(since_id=since_id)]
+
+    def _get(self, column, value):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id, type, text, section, requirements, active FROM testcases "
+                f"WHERE {column} = ?",
+                (value,),
+            ).fetchone()
+        if row is None:
+            return None
+        return {"id": row[0], "type": row[1], "text": row[2], "section": row[3],
+                "requirements": json.loads(row[4]), "active": bool(row[5])}
+
+    def get(self, testcase_id: int):
+        return self._get("id", testcase_id)
+
+    def get_by_hash(self, text_or_hash: str):
+        """Row with this content (numbering, case and spacing ignored) or content hash."""
+        key = text_or_hash
+        if not (len(key) == 40 and all(c in "0123456789abcdef" for c in key)):
+            key = testcase_key(text_or_hash)
+        return self._get("content_hash", key)
+
+    # ---------------- testcases.txt ----------------
+    def export_txt(self, path: Path):
+        """Write the active rows as testcases.txt, one numbered block per batch."""
+        batches = {}
+        for row in self.rows():
+            batches.setdefault(row["batch"], {k: [] for k in TESTCASE_TYPES})[row["type"]].append(row["text"])
+
+        with Path(path).open("w", encoding="utf-8") as f:
+            for grouped in batches.values():
+                for kind in TESTCASE_TYPES:
+                    f.write(f"{kind}:\n")
+                    for i, text in enumerate(grouped[kind], 1):
+                        f.write(f"{i}. {text}\n")
+                    f.write("\n")
+
+    def import_txt(self, path: Path):
+        """Load a testcases.txt written before the store existed (one batch per block)."""
+        blocks = []
+        current = None
+        for line in Path(path).read_text(encoding="utf-8").splitlines():
+            line = line.strip()
+            header = line.rstrip(":")
+            if header in TESTCASE_TYPES:
+                if header == "Positive" or not blocks:
+                    blocks.append([])
+                current = header
+            elif current and line:
+                blocks[-1].append((current, line, None, []))
+
+        for block in blocks:
+            self.append(block)
+        return len(self)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
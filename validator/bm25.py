@@ -0,0 +1,87 @@
+import math
+import re
+from collections import Counter, defaultdict
+
+from config import BM25_TOP_N, BM25_K1, BM25_B
+
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:_[a-z0-9]+)*")
+
+# Words every testcase/requirement shares; they only add noise to BM25
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "if",
+    "in", "is", "it", "of", "on", "or", "that", "the", "this", "to", "when",
+    "with", "verify", "system", "should", "must", "will", "shall",
+}
+
+
+def tokenize(text: str):
+    """
+    Lowercased word tokens. Identifiers such as FACT_LOAN_BALANCE are
+    kept whole and also split into their parts.
+    """
+    tokens = []
+    for token in TOKEN_PATTERN.findall(text.lower()):
+        if token in STOPWORDS:
+            continue
+        tokens.append(token)
+        if "_" in token:
+            tokens.extend(part for part in token.split("_") if part not in STOPWORDS)
+    return tokens
+
+
+# ================================
+# Inverted Index + BM25
+# ================================
+class BM25Index:
+    """In-process inverted index over testcase texts with Okapi BM25 scoring."""
+
+    def __init__(self, documents, k1: float = BM25_K1, b: float = BM25_B):
+        self.k1 = k1
+        self.b = b
+        self.postings = defaultdict(list)
+        self.doc_lengths = []
+
+        for doc_id, text in enumerate(documents):
+            counts = Counter(tokenize(text))
+            self.doc_lengths.append(sum(counts.values()))
+            for term, tf in counts.items():
+                self.postings[term].append((doc_id, tf))
+
+        self.n_docs = len(self.doc_lengths)
+        self.avg_length = (sum(self.doc_lengths) / self.n_docs) if self.n_docs else 0.0
+        self.idf = {
+            term: math.log(1 + (self.n_docs - len(docs) + 0.5) / (len(docs) + 0.5))
+            for term, docs in self.postings.items()
+        }
+
+    def scores(self, query: str):
+        """{doc_id: BM25 score} for documents sharing at least one query term."""
+        scores = defaultdict(float)
+        avg_length = self.avg_length or 1.0
+
+        for term in set(tokenize(query)):
+            idf = self.idf.get(term)
+            if idf is None:
+                continue
+            for doc_id, tf in self.postings[term]:
+                norm = self.k1 * (1 - self.b + self.b * self.doc_lengths[doc_id] / avg_length)
+                scores[doc_id] += idf * tf * (self.k1 + 1) / (tf + norm)
+
+        return scores
+
+    def search(self, query: str, top_n: int = BM25_TOP_N):
+        """Top `top_n` doc ids by BM25 score, best first."""
+        scores = self.scores(query)
+        return sorted(scores, key=lambda doc_id: (-scores[doc_id], doc_id))[:top_n]
+
+
+def bm25_shortlists(queries, documents, top_n: int = BM25_TOP_N):
+    """
+    Per query, the sorted ids of its top `top_n` lexical matches.
+
+    `top_n` is the recall knob: larger keeps more candidates for the
+    embedding and NLI stages.
+    """
+    index = BM25Index(documents)
+    return [sorted(index.search(query, top_n)) for query in queries]
@@ -1,8 +1,5 @@
 import json
-from json.tool import main
 from pathlib import Path
-from validator.validator import validate_testcases
-from config import MODE
 import sys
 from config import (
     MODE,
@@ -13,10 +10,8 @@ from config import (
     PROCESSED_SSD_FILE
 )
 
-from data_processing.raw_extraction import extract_docx_sections
-from data_processing.data_classification import aggregate_important_requirements
+from data_processing.ssd_cache import process_ssd
 from validator.validator import validate_testcases
-from generator.generator import run_generator
 
 
 # Add project root to sys.path
@@ -26,15 +21,10 @@ sys.path.append(str(Path(__file__).parent.parent.resolve()))
 def run_cli():
     print("Standalone Validator CLI")
 
-    print("Extracting SSD document...")
     ssd_docx_path = Path(input("Enter path of your SSD : ").strip())
-    raw_ssd_data = extract_docx_sections(ssd_docx_path)
-
-
-    # 2) Classify SSD data
 
-    print("Classifying important requirements...")
-    classified_data = aggregate_important_requirements(raw_ssd_data)
+    # Extract + classify SSD (cached by DOCX content hash)
+    _, classified_data, _ = process_ssd(ssd_docx_path)
 
     PROCESSED_SSD_FILE.parent.mkdir(parents=True, exist_ok=True)
     with PROCESSED_SSD_FILE.open("w", encoding="utf-8") as f:
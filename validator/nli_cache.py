@@ -0,0 +1,87 @@
+import sqlite3
+import threading
+from pathlib import Path
+
+from config import NLI_CACHE_FILE
+from embedding_cache import text_hash
+
+
+# SQLite caps the number of bound parameters per statement
+_SQL_CHUNK = 300
+
+
+# ================================
+# Persistent NLI Score Cache
+# ================================
+class NLIScoreCache:
+    """
+    Entailment scores keyed by (NLI model, testcase hash, requirement hash).
+
+    Lets each feedback iteration pay only for pairs it has not scored before.
+    """
+
+    def __init__(self, path: Path = NLI_CACHE_FILE):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS nli_scores (
+                model TEXT NOT NULL,
+                tc_hash TEXT NOT NULL,
+                req_hash TEXT NOT NULL,
+                score REAL NOT NULL,
+                PRIMARY KEY (model, tc_hash, req_hash)
+            )
+        """)
+        self._conn.commit()
+
+    def get_many(self, model_name: str, pairs):
+        """Cached scores aligned with (testcase, requirement) `pairs`; None when unseen."""
+        keys = [(text_hash(tc), text_hash(req)) for tc, req in pairs]
+        found = {}
+
+        with self._lock:
+            unique = list(set(keys))
+            for start in range(0, len(unique), _SQL_CHUNK):
+                chunk = unique[start:start + _SQL_CHUNK]
+                clause = " OR ".join(["(tc_hash = ? AND req_hash = ?)"] * len(chunk))
+                params = [h for key in chunk for h in key]
+                for tc_hash, req_hash, score in self._conn.execute(
+                    f"SELECT tc_hash, req_hash, score FROM nli_scores "
+                    f"WHERE model = ? AND ({clause})",
+                    (model_name, *params),
+                ):
+                    found[(tc_hash, req_hash)] = score
+
+        return [found.get(key) for key in keys]
+
+    def put_many(self, model_name: str, pairs, scores):
+        rows = [
+            (model_name, text_hash(tc), text_hash(req), float(score))
+            for (tc, req), score in zip(pairs, scores)
+        ]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO nli_scores (model, tc_hash, req_hash, score) "
+                "VALUES (?, ?, ?, ?)",
+                rows,
+            )
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_nli_cache() -> NLIScoreCache:
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = NLIScoreCache()
+    return _cache
@@ -0,0 +1,113 @@
+import atexit
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+from config import (
+    NLI_MODEL,
+    NLI_BATCH_SIZE,
+    NLI_WORKERS,
+    NLI_THREADS_PER_WORKER,
+    NLI_SHARD_SIZE,
+)
+
+
+# ================================
+# Worker Side
+# ================================
+_worker_model = None
+
+
+def _init_worker(model_name: str, num_threads: int):
+    """Runs once per worker process: bind threads, load the cross-encoder."""
+    global _worker_model
+
+    import torch
+    from model_registry import get_cross_encoder
+
+    torch.set_num_threads(num_threads)
+    _worker_model = get_cross_encoder(model_name)
+
+
+def _score_shard(shard):
+    pairs, batch_size = shard
+    return _worker_model.predict(pairs, batch_size=batch_size, convert_to_numpy=True)
+
+
+# ================================
+# Pool (kept warm across calls)
+# ================================
+_pool = None
+_pool_key = None
+_pool_lock = threading.Lock()
+
+
+def threads_per_worker(workers: int) -> int:
+    if NLI_THREADS_PER_WORKER:
+        return NLI_THREADS_PER_WORKER
+    return max(1, (os.cpu_count() or 1) // workers)
+
+
+def get_pool(workers: int = NLI_WORKERS, model_name: str = NLI_MODEL):
+    """Process pool whose workers each hold one loaded cross-encoder."""
+    global _pool, _pool_key
+
+    key = (workers, model_name)
+    with _pool_lock:
+        if _pool is None or _pool_key != key:
+            if _pool is not None:
+                _pool.shutdown()
+            print(f"Starting {workers} NLI worker processes...")
+            _pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(model_name, threads_per_worker(workers)),
+            )
+            _pool_key = key
+    return _pool
+
+
+def shutdown_pool():
+    global _pool, _pool_key
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown()
+        _pool = None
+        _pool_key = None
+
+
+atexit.register(shutdown_pool)
+
+
+# ================================
+# Sharded Scoring (PUBLIC API)
+# ================================
+def parallel_predict_logits(
+    pairs,
+    workers: int = NLI_WORKERS,
+    batch_size: int = NLI_BATCH_SIZE,
+    shard_size: int = NLI_SHARD_SIZE,
+    model_name: str = NLI_MODEL,
+):
+    """
+    Cross-encoder logits for `pairs`, sharded across worker processes.
+
+    Shards are contiguous and a multiple of `batch_size`, so every model
+    batch is the same one the serial path would build, and results are
+    concatenated back in input order.
+    """
+    import numpy as np
+
+    if not pairs:
+        return np.zeros((0, 3), dtype=np.float32)
+
+    shard_size = max(batch_size, -(-shard_size // batch_size) * batch_size)
+    shards = [
+        (pairs[start:start + shard_size], batch_size)
+        for start in range(0, len(pairs), shard_size)
+    ]
+
+    pool = get_pool(workers, model_name)
+    return np.concatenate(list(pool.map(_score_shard, shards)))
@@ -0,0 +1,320 @@
+import numpy as np
+
+from config import (
+    RETRIEVAL_MODE,
+    RETRIEVAL_TOP_K,
+    RETRIEVAL_BLOCK_SIZE,
+    IVF_NLIST,
+    IVF_NPROBE,
+    SIMILARITY_TILE_ROWS,
+    SIMILARITY_TILE_COLS,
+    SIMILARITY_MEMORY_CAP_MB,
+)
+
+# Working bytes per similarity cell (float32 score + bool mask + slack)
+_BYTES_PER_CELL = 6
+# Bytes per kept candidate (int64 req idx, int64 tc idx, float32 score)
+_BYTES_PER_PAIR = 20
+# Peak bytes per kept candidate while finishing a blocked scan: two copies of
+# the pairs at once (chunks + concatenation, then concatenation + sorted
+# result) plus the int64 sort order
+_PEAK_BYTES_PER_PAIR = 2 * _BYTES_PER_PAIR + 8
+
+
+# Candidate retrieval returns three aligned arrays, requirement-major and
+# ascending testcase index within a requirement (same order as the old
+# nested loop):  req_idx, tc_idx, similarity
+
+
+def _empty_candidates():
+    return (
+        np.zeros(0, dtype=np.int64),
+        np.zeros(0, dtype=np.int64),
+        np.zeros(0, dtype=np.float32),
+    )
+
+
+def _collect(best_idx_rows, best_sim_rows, threshold):
+    req_idx, tc_idx, sims = [], [], []
+
+    for i, (idx, sim) in enumerate(zip(best_idx_rows, best_sim_rows)):
+        keep = sim >= threshold
+        if not keep.any():
+            continue
+        idx, sim = idx[keep], sim[keep]
+        order = np.argsort(idx, kind="stable")
+        req_idx.append(np.full(len(order), i, dtype=np.int64))
+        tc_idx.append(idx[order])
+        sims.append(sim[order])
+
+    if not req_idx:
+        return _empty_candidates()
+    return np.concatenate(req_idx), np.concatenate(tc_idx), np.concatenate(sims)
+
+
+# ================================
+# Exhaustive (original behaviour)
+# ================================
+def exhaustive_candidates(req_emb, tc_emb, threshold):
+    from sklearn.metrics.pairwise import cosine_similarity
+
+    sim_matrix = cosine_similarity(req_emb, tc_emb)
+    req_idx, tc_idx = np.nonzero(sim_matrix >= threshold)
+    return req_idx, tc_idx, sim_matrix[req_idx, tc_idx]
+
+
+# ================================
+# Memory-bounded blocked scan
+# ================================
+def fit_tiles(tile_rows, tile_cols, budget_bytes):
+    """Shrink tile sizes (columns first) until one tile fits in budget_bytes."""
+    max_cells = budget_bytes // _BYTES_PER_CELL
+    if max_cells < 1:
+        raise MemoryError("Similarity memory cap too small for a single tile.")
+
+    tile_cols = max(1, min(tile_cols, max_cells // max(tile_rows, 1)))
+    tile_rows = max(1, min(tile_rows, max_cells // tile_cols))
+    return tile_rows, tile_cols
+
+
+def _split_budget(req_emb, tc_emb, memory_cap_mb):
+    budget = int(memory_cap_mb * 1024 * 1024)
+    embeddings = req_emb.nbytes + tc_emb.nbytes
+    if embeddings >= budget:
+        raise MemoryError(
+            f"Embeddings alone need {embeddings / 2**20:.1f} MB, above "
+            f"SIMILARITY_MEMORY_CAP_MB={memory_cap_mb}."
+        )
+    # Half of what is left for tiles, half for the candidate pairs
+    remaining = budget - embeddings
+    return remaining // 2, remaining - remaining // 2
+
+
+def iter_blocked_candidates(
+    req_emb,
+    tc_emb,
+    threshold,
+    tile_rows=SIMILARITY_TILE_ROWS,
+    tile_cols=SIMILARITY_TILE_COLS,
+    memory_cap_mb=SIMILARITY_MEMORY_CAP_MB,
+):
+    """
+    Yield (req_idx, tc_idx, similarity) chunks one tile at a time.
+
+    Only one requirements x testcases tile is materialized at once; tiles
+    are sized to fit half of what the memory cap leaves after embeddings.
+    Embeddings must be L2-normalized.
+    """
+    tile_budget, _ = _split_budget(req_emb, tc_emb, memory_cap_mb)
+    tile_rows, tile_cols = fit_tiles(tile_rows, tile_cols, tile_budget)
+
+    for r0 in range(0, len(req_emb), tile_rows):
+        req_tile = req_emb[r0:r0 + tile_rows]
+        for c0 in range(0, len(tc_emb), tile_cols):
+            sims = req_tile @ tc_emb[c0:c0 + tile_cols].T
+            i, j = np.nonzero(sims >= threshold)
+            if len(i):
+                yield i + r0, j + c0, sims[i, j].astype(np.float32)
+
+
+def blocked_candidates(
+    req_emb,
+    tc_emb,
+    threshold,
+    tile_rows=SIMILARITY_TILE_ROWS,
+    tile_cols=SIMILARITY_TILE_COLS,
+    memory_cap_mb=SIMILARITY_MEMORY_CAP_MB,
+):
+    """
+    Same pairs as exhaustive_candidates, computed tile by tile.
+
+    Raises MemoryError when the candidate pairs, counted at their peak
+    while being concatenated and sorted, outgrow their share of the cap
+    (use "topk" or a higher threshold for such suites).
+    """
+    _, pair_budget = _split_budget(req_emb, tc_emb, memory_cap_mb)
+
+    chunks = []
+    kept = 0
+    for chunk in iter_blocked_candidates(
+        req_emb, tc_emb, threshold, tile_rows, tile_cols, memory_cap_mb
+    ):
+        kept += len(chunk[0])
+        if kept * _PEAK_BYTES_PER_PAIR > pair_budget:
+            raise MemoryError(
+                f"{kept} candidate pairs exceed SIMILARITY_MEMORY_CAP_MB={memory_cap_mb}."
+            )
+        chunks.append(chunk)
+
+    if not chunks:
+        return _empty_candidates()
+
+    req_idx, tc_idx, sims = (np.concatenate(parts) for parts in zip(*chunks))
+    chunks.clear()
+    order = np.lexsort((tc_idx, req_idx))
+    return req_idx[order], tc_idx[order], sims[order]
+
+
+# ================================
+# Shortlisted pairs (after a lexical prefilter)
+# ================================
+def shortlist_candidates(req_emb, tc_emb, shortlists, threshold):
+    """
+    Score only the shortlisted testcases of each requirement.
+
+    shortlists[i] holds sorted row indices into tc_emb for requirement i.
+    Embeddings must be L2-normalized.
+    """
+    req_idx, tc_idx, sims = [], [], []
+
+    for i, rows in enumerate(shortlists):
+        if not len(rows):
+            continue
+        rows = np.asarray(rows, dtype=np.int64)
+        row_sims = (tc_emb[rows] @ req_emb[i]).astype(np.float32)
+        keep = row_sims >= threshold
+        req_idx.append(np.full(int(keep.sum()), i, dtype=np.int64))
+        tc_idx.append(rows[keep])
+        sims.append(row_sims[keep])
+
+    if not req_idx:
+        return _empty_candidates()
+    return np.concatenate(req_idx), np.concatenate(tc_idx), np.concatenate(sims)
+
+
+# ================================
+# Exact blocked top-k
+# ================================
+def topk_candidates(req_emb, tc_emb, threshold, k=RETRIEVAL_TOP_K, block_size=RETRIEVAL_BLOCK_SIZE):
+    """
+    Exact top-k per requirement, scanning testcases in blocks so only
+    requirements x block_size similarities exist at any time.
+    Embeddings must be L2-normalized.
+    """
+    n_req = len(req_emb)
+    best_sim = np.empty((n_req, 0), dtype=np.float32)
+    best_idx = np.empty((n_req, 0), dtype=np.int64)
+
+    for start in range(0, len(tc_emb), block_size):
+        block = tc_emb[start:start + block_size]
+        block_sim = (req_emb @ block.T).astype(np.float32)
+        block_idx = np.broadcast_to(
+            np.arange(start, start + len(block), dtype=np.int64), block_sim.shape
+        )
+
+        sims = np.concatenate([best_sim, block_sim], axis=1)
+        idx = np.concatenate([best_idx, block_idx], axis=1)
+
+        if sims.shape[1] > k:
+            part = np.argpartition(-sims, k - 1, axis=1)[:, :k]
+            sims = np.take_along_axis(sims, part, axis=1)
+            idx = np.take_along_axis(idx, part, axis=1)
+
+        best_sim, best_idx = sims, idx
+
+    return _collect(best_idx, best_sim, threshold)
+
+
+# ================================
+# Approximate IVF index
+# ================================
+class IVFIndex:
+    """
+    Inverted-file index over L2-normalized testcase embeddings.
+
+    Testcases are clustered with spherical k-means; a query only scores
+    the testcases in its `nprobe` closest clusters.
+    """
+
+    def __init__(self, nlist=IVF_NLIST, nprobe=IVF_NPROBE, n_iter=10, seed=0):
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.n_iter = n_iter
+        self.seed = seed
+        self.embeddings = None
+        self.centroids = None
+        self.lists = []
+
+    def _assign(self, emb, block_size=RETRIEVAL_BLOCK_SIZE):
+        return np.concatenate([
+            np.argmax(emb[start:start + block_size] @ self.centroids.T, axis=1)
+            for start in range(0, len(emb), block_size)
+        ])
+
+    def build(self, tc_emb):
+        tc_emb = np.asarray(tc_emb, dtype=np.float32)
+        n = len(tc_emb)
+        nlist = min(self.nlist or max(1, int(np.sqrt(n))), n)
+
+        rng = np.random.default_rng(self.seed)
+        self.centroids = tc_emb[rng.choice(n, nlist, replace=False)].copy()
+
+        for _ in range(self.n_iter):
+            assign = self._assign(tc_emb)
+            for c in range(nlist):
+                members = tc_emb[assign == c]
+                if len(members):
+                    centroid = members.mean(axis=0)
+                    self.centroids[c] = centroid / (np.linalg.norm(centroid) or 1.0)
+
+        assign = self._assign(tc_emb)
+        self.lists = [np.flatnonzero(assign == c) for c in range(nlist)]
+        self.embeddings = tc_emb
+        return self
+
+    def add(self, tc_emb):
+        """Add testcases to their closest existing clusters (no re-clustering)."""
+        tc_emb = np.asarray(tc_emb, dtype=np.float32)
+        if not len(tc_emb):
+            return self
+        assign = self._assign(tc_emb)
+        offset = len(self.embeddings)
+        self.embeddings = np.concatenate([self.embeddings, tc_emb])
+        for c in np.unique(assign):
+            self.lists[c] = np.concatenate([self.lists[c], offset + np.flatnonzero(assign == c)])
+        return self
+
+    def search(self, req_emb, threshold, k=RETRIEVAL_TOP_K):
+        nprobe = min(self.nprobe, len(self.centroids))
+        centroid_sim = req_emb @ self.centroids.T
+        probes = np.argpartition(-centroid_sim, nprobe - 1, axis=1)[:, :nprobe]
+
+        best_idx, best_sim = [], []
+        for query, probe in zip(req_emb, probes):
+            cand = np.concatenate([self.lists[c] for c in probe])
+            sims = self.embeddings[cand] @ query
+            if len(cand) > k:
+                top = np.argpartition(-sims, k - 1)[:k]
+                cand, sims = cand[top], sims[top]
+            best_idx.append(cand)
+            best_sim.append(sims)
+
+        return _collect(best_idx, best_sim, threshold)
+
+
+# ================================
+# Dispatcher
+# ================================
+def find_candidates(req_emb, tc_emb, threshold, mode=RETRIEVAL_MODE, k=RETRIEVAL_TOP_K):
+    """
+    Candidate (requirement, testcase) pairs with similarity >= threshold.
+
+    mode: "exhaustive" (full matrix), "blocked" (same pairs, bounded
+    memory), "topk" (exact, at most k per requirement) or "ivf"
+    (approximate, at most k per requirement).
+    """
+    if len(req_emb) == 0 or len(tc_emb) == 0:
+        return _empty_candidates()
+
+    if mode == "exhaustive":
+        return exhaustive_candidates(req_emb, tc_emb, threshold)
+    if mode == "blocked":
+        return blocked_candidates(req_emb, tc_emb, threshold)
+    if mode == "topk":
+        return topk_candidates(req_emb, tc_emb, threshold, k=k)
+    if mode == "ivf":
+        return IVFIndex().build(tc_emb).search(req_emb, threshold, k=k)
+
+    raise ValueError(
+        f"Invalid retrieval mode '{mode}'. Use 'exhaustive', 'blocked', 'topk' or 'ivf'"
+    )
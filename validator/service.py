@@ -0,0 +1,302 @@
+"""
+Warm validator service.
+
+Keeps the embedder and NLI cross-encoder loaded and serves validation
+jobs over localhost HTTP. Concurrent jobs are batched together so the
+models see one embedding call and one NLI call per batch.
+
+Run:     python -m validator.service [--host HOST] [--port PORT]
+API:     POST /validate  {"requirements": {<category>: [<text>, ...]}, "testcases": "<txt contents>",
+                          "options": {"retrieval_mode": ..., "nli_batch_size": ...}}  (options optional)
+         GET  /health
+Returns: {"coverage", "missing", "completeness", "accuracy", "total"}
+"""
+import json
+import queue
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from config import (
+    SEMANTIC_THRESHOLD,
+    NLI_BATCH_SIZE,
+    EMBEDDING_MODEL,
+    NLI_MODEL,
+    RETRIEVAL_MODE,
+    VALIDATOR_SERVICE_HOST,
+    VALIDATOR_SERVICE_PORT,
+    VALIDATOR_BATCH_WINDOW_MS,
+    VALIDATOR_MAX_BATCH_JOBS,
+)
+from validator.validator import (
+    parse_requirements,
+    parse_testcases,
+    nli_entailment_scores,
+    summarize_validation,
+)
+
+
+class ServiceUnavailable(Exception):
+    pass
+
+
+# ================================
+# Batched Validation
+# ================================
+# Per-job options the service honours; everything else (coverage-only,
+# cascade, BM25) is validated locally by the client
+SERVICE_OPTIONS = {"retrieval_mode": RETRIEVAL_MODE, "nli_batch_size": NLI_BATCH_SIZE}
+
+
+def validate_batch(jobs):
+    """
+    Validate several (requirements, testcases[, options]) jobs together.
+
+    Texts of all jobs share one embedding call, and candidate pairs of
+    all jobs with the same nli_batch_size share one NLI call. Retrieval
+    and NLI batch size follow each job's options; NLI batches may mix
+    pairs of several jobs, so padding (and the last digits of a score)
+    can differ slightly from a local validate_testcases run.
+    """
+    from embedding_cache import embed_texts
+    from validator.retrieval import find_candidates
+
+    jobs = [
+        (job[0], job[1], {**SERVICE_OPTIONS, **(job[2] if len(job) > 2 else {})})
+        for job in jobs
+    ]
+
+    texts = []
+    for requirements, testcases, _ in jobs:
+        texts.extend(r["text"] for r in requirements)
+        texts.extend(testcases)
+    embeddings = embed_texts(texts, EMBEDDING_MODEL)
+
+    offset = 0
+    candidates = []
+    for requirements, testcases, options in jobs:
+        req_emb = embeddings[offset:offset + len(requirements)]
+        offset += len(requirements)
+        tc_emb = embeddings[offset:offset + len(testcases)]
+        offset += len(testcases)
+
+        req_idx, tc_idx, _ = find_candidates(
+            req_emb, tc_emb, SEMANTIC_THRESHOLD, mode=options["retrieval_mode"]
+        )
+        pairs = [(testcases[j], requirements[i]["text"]) for i, j in zip(req_idx, tc_idx)]
+        candidates.append((req_idx, tc_idx, pairs))
+
+    by_batch_size = {}
+    for n, (_, _, options) in enumerate(jobs):
+        by_batch_size.setdefault(options["nli_batch_size"], []).append(n)
+
+    entailment = [None] * len(jobs)
+    for batch_size, members in by_batch_size.items():
+        scores = nli_entailment_scores(
+            [pair for n in members for pair in candidates[n][2]], batch_size=batch_size
+        )
+        start = 0
+        for n in members:
+            entailment[n] = scores[start:start + len(candidates[n][2])]
+            start += len(candidates[n][2])
+
+    results = []
+    for (requirements, testcases, _), (req_idx, tc_idx, _), scores in zip(jobs, candidates, entailment):
+        coverage, missing, completeness, accuracy = summarize_validation(
+            requirements, testcases, req_idx, tc_idx, scores
+        )
+        results.append({
+            "coverage": coverage,
+            "missing": missing,
+            "completeness": float(completeness),
+            "accuracy": float(accuracy),
+            "total": len(requirements),
+        })
+    return results
+
+
+class BatchingValidator:
+    """Collects jobs for up to `window_ms` and validates them as one batch."""
+
+    def __init__(self, window_ms=VALIDATOR_BATCH_WINDOW_MS, max_jobs=VALIDATOR_MAX_BATCH_JOBS):
+        self.window = window_ms / 1000
+        self.max_jobs = max_jobs
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def submit(self, requirements, testcases, options=None) -> Future:
+        future = Future()
+        self._queue.put((requirements, testcases, options or {}, future))
+        return future
+
+    def _next_batch(self):
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.window
+        while len(batch) < self.max_jobs:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            try:
+                results = validate_batch([job[:3] for job in batch])
+            except Exception as e:
+                if len(batch) == 1:
+                    batch[0][-1].set_exception(e)
+                    continue
+                # One bad job must not fail the others: retry each on its own
+                for job in batch:
+                    try:
+                        job[-1].set_result(validate_batch([job[:3]])[0])
+                    except Exception as job_error:
+                        job[-1].set_exception(job_error)
+                continue
+            for (*_, future), result in zip(batch, results):
+                future.set_result(result)
+
+
+# ================================
+# HTTP Server
+# ================================
+class ValidatorHandler(BaseHTTPRequestHandler):
+    validator = None
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path != "/health":
+            self._send_json(404, {"error": "not found"})
+            return
+
+        from model_registry import loaded_models
+        models = [f"{name} ({backend})" for _, name, backend in loaded_models()]
+        self._send_json(200, {"status": "ok", "models": models})
+
+    def do_POST(self):
+        if self.path != "/validate":
+            self._send_json(404, {"error": "not found"})
+            return
+
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            payload = json.loads(self.rfile.read(length).decode("utf-8"))
+            requirements = parse_requirements(payload["requirements"])
+            testcases = parse_testcases(payload["testcases"].splitlines())
+            options = dict(payload.get("options") or {})
+            unknown = set(options) - set(SERVICE_OPTIONS)
+            if unknown:
+                raise ValueError(f"unsupported options {sorted(unknown)}")
+            if "nli_batch_size" in options:
+                options["nli_batch_size"] = int(options["nli_batch_size"])
+                if options["nli_batch_size"] < 1:
+                    raise ValueError("nli_batch_size must be positive")
+            if options.get("retrieval_mode", RETRIEVAL_MODE) not in ("exhaustive", "blocked", "topk", "ivf"):
+                raise ValueError(f"invalid retrieval_mode {options['retrieval_mode']!r}")
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            self._send_json(400, {"error": f"invalid job: {e}"})
+            return
+
+        if not requirements or not testcases:
+            self._send_json(400, {"error": "Empty requirements or test cases provided."})
+            return
+
+        try:
+            result = self.validator.submit(requirements, testcases, options).result()
+        except Exception as e:
+            self._send_json(500, {"error": str(e)})
+            return
+
+        self._send_json(200, result)
+
+
+def serve(host=VALIDATOR_SERVICE_HOST, port=VALIDATOR_SERVICE_PORT):
+    from model_registry import get_embedder, get_cross_encoder
+
+    print("Warming up models...")
+    get_embedder(EMBEDDING_MODEL)
+    get_cross_encoder(NLI_MODEL)
+
+    ValidatorHandler.validator = BatchingValidator()
+    server = ThreadingHTTPServer((host, port), ValidatorHandler)
+    print(f"Validator service listening on http://{host}:{port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+# ================================
+# Client
+# ================================
+def request_validation(
+    requirement_file: Path,
+    testcase_file: Path,
+    service_url: str,
+    timeout=600,
+    options=None,
+):
+    """
+    Send one validation job to the service and return its JSON result.
+    `options` may set any of SERVICE_OPTIONS.
+    """
+    testcase_file = Path(testcase_file)
+    if testcase_file.suffix == ".sqlite":
+        from validator.validator import load_testcases
+
+        testcases = "\n".join(load_testcases(testcase_file))
+    else:
+        testcases = testcase_file.read_text(encoding="utf-8")
+
+    payload = {
+        "requirements": json.loads(Path(requirement_file).read_text(encoding="utf-8")),
+        "testcases": testcases,
+        "options": options or {},
+    }
+    request = urllib.request.Request(
+        service_url.rstrip("/") + "/validate",
+        data=json.dumps(payload, ensure_ascii=False).encode("utf-8"),
+        headers={"Content-Type": "application/json"},
+        method="POST",
+    )
+
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return json.loads(response.read().decode("utf-8"))
+    except urllib.error.HTTPError as e:
+        detail = e.read().decode("utf-8", errors="replace")
+        if e.code == 400:
+            raise ValueError(json.loads(detail).get("error", detail)) from e
+        raise ServiceUnavailable(f"HTTP {e.code}: {detail}") from e
+    except (urllib.error.URLError, ConnectionError, TimeoutError) as e:
+        raise ServiceUnavailable(str(e)) from e
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Warm validator service")
+    parser.add_argument("--host", default=VALIDATOR_SERVICE_HOST)
+    parser.add_argument("--port", type=int, default=VALIDATOR_SERVICE_PORT)
+    args = parser.parse_args()
+
+    serve(args.host, args.port)
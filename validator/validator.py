@@ -1,10 +1,6 @@
 
 import json
-import numpy as np
 from pathlib import Path
-from sentence_transformers import SentenceTransformer, CrossEncoder
-from sklearn.metrics.pairwise import cosine_similarity
-from scipy.special import softmax
 
 from config import (
     MODE,
@@ -12,22 +8,28 @@ from config import (
     NLI_THRESHOLD,
     COMPLETENESS_THRESHOLD,
     ACCURACY_THRESHOLD,
+    EMBEDDING_MODEL,
+    NLI_MODEL,
+    NLI_BATCH_SIZE,
+    RETRIEVAL_MODE,
+    NLI_CACHE_ENABLED,
+    COVERAGE_ONLY,
+    COVERAGE_PROBE_SIZE,
+    NLI_WORKERS,
+    CASCADE_ENABLED,
+    CASCADE_CHEAP_MODEL,
+    CASCADE_LOW,
+    CASCADE_HIGH,
+    BM25_PREFILTER,
+    BM25_TOP_N,
+    VALIDATOR_SERVICE_URL,
 )
+from model_registry import get_cross_encoder, model_cache_id
 
 # Generator is imported lazily to avoid circular issues
 # (only used in integrated feedback loop)
 
 
-# -----------------------------
-# Models (loaded once)
-# -----------------------------
-EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L12-v2"
-NLI_MODEL = "cross-encoder/nli-deberta-v3-small"
-
-embedder = SentenceTransformer(EMBEDDING_MODEL)
-nli_model = CrossEncoder(NLI_MODEL)
-
-
 # ================================
 # Load JSON requirements
 # ================================
@@ -35,6 +37,10 @@ def load_requirements(json_path: Path):
     with json_path.open("r", encoding="utf-8") as f:
         data = json.load(f)
 
+    return parse_requirements(data)
+
+
+def parse_requirements(data: dict):
     requirements = []
     for section, items in data.items():
         for item in items:
@@ -51,70 +57,303 @@ def load_requirements(json_path: Path):
 # ================================
 # Load test cases (TXT)
 # ================================
-def load_testcases(txt_path: Path):
+def load_testcases(txt_path: Path, since_id: int = 0):
+    """
+    Testcase texts from testcases.txt, or from the testcase store when
+    given its .sqlite file (there `since_id` limits it to newer rows).
+    """
+    if txt_path.suffix == ".sqlite":
+        from testcase_store import TestcaseStore
+
+        return TestcaseStore(txt_path).texts(since_id=since_id)
+
     with txt_path.open("r", encoding="utf-8") as f:
-        return [line.strip() for line in f if line.strip()]
+        return parse_testcases(f)
+
+
+def parse_testcases(lines):
+    return [line.strip() for line in lines if line.strip()]
 
 
 # ================================
-# Core Validator (PUBLIC API)
+# NLI Scoring (batched)
 # ================================
-def validate_testcases(
-    requirement_file: Path,
-    testcase_file: Path,
-):
-    print("Loading requirements...")
-    requirements = load_requirements(requirement_file)
-    req_texts = [r["text"] for r in requirements]
+def predict_entailment(pairs, batch_size: int = NLI_BATCH_SIZE, workers: int = NLI_WORKERS):
+    """
+    Entailment probability for each (testcase, requirement) pair.
 
-    print("Loading test cases...")
-    testcases = load_testcases(testcase_file)
+    All pairs go through the cross-encoder in batches of `batch_size`
+    instead of one forward pass per pair. With workers > 1 the pairs are
+    sharded across a process pool (see validator.parallel).
+    """
+    import numpy as np
+    from scipy.special import softmax
 
-    if not requirements or not testcases:
-        raise ValueError("Empty requirements or test cases provided.")
+    if not pairs:
+        return np.zeros(0, dtype=np.float32)
 
-    print("Generating embeddings...")
-    req_emb = embedder.encode(
-        req_texts,
-        convert_to_numpy=True,
-        normalize_embeddings=True
-    )
-    tc_emb = embedder.encode(
-        testcases,
-        convert_to_numpy=True,
-        normalize_embeddings=True
+    if workers > 1:
+        from validator.parallel import parallel_predict_logits
+
+        logits = parallel_predict_logits(pairs, workers=workers, batch_size=batch_size)
+    else:
+        nli_model = get_cross_encoder(NLI_MODEL)
+        logits = nli_model.predict(
+            pairs,
+            batch_size=batch_size,
+            convert_to_numpy=True
+        )
+    return softmax(logits, axis=1)[:, 2]  # entailment
+
+
+def nli_entailment_scores(pairs, batch_size: int = NLI_BATCH_SIZE, use_cache: bool = NLI_CACHE_ENABLED):
+    """
+    Like predict_entailment, but pairs already scored in an earlier
+    iteration or run are read from the NLI score cache.
+    """
+    import numpy as np
+
+    if not use_cache or not pairs:
+        return predict_entailment(pairs, batch_size)
+
+    from validator.nli_cache import get_nli_cache
+
+    cache = get_nli_cache()
+    cache_id = model_cache_id("cross_encoder", NLI_MODEL)
+    scores = cache.get_many(cache_id, pairs)
+
+    # Unique unseen pairs, in first-seen order
+    todo = list(dict.fromkeys(
+        pair for pair, score in zip(pairs, scores) if score is None
+    ))
+    print(f"NLI pairs: {len(pairs)} total, {len(pairs) - len(todo)} cached, {len(todo)} to score")
+
+    if todo:
+        fresh = predict_entailment(todo, batch_size)
+        cache.put_many(cache_id, todo, fresh)
+
+        fresh_by_pair = dict(zip(todo, fresh))
+        scores = [
+            fresh_by_pair[pair] if score is None else score
+            for pair, score in zip(pairs, scores)
+        ]
+
+    return np.asarray(scores, dtype=np.float32)
+
+
+# ================================
+# Cascade Scoring (cheap stage first)
+# ================================
+def calibrate_cascade_band(stage1_scores, full_entailed, target_agreement: float = 0.98):
+    """
+    Suggest (low, high) stage-1 cutoffs from a run where every pair was
+    also scored by the full NLI model.
+
+    `high` is the lowest cutoff whose accepted pairs agree with the full
+    model at least `target_agreement` of the time; `low` the highest
+    cutoff whose rejected pairs do.
+    """
+    import numpy as np
+
+    stage1_scores = np.asarray(stage1_scores, dtype=np.float64)
+    full_entailed = np.asarray(full_entailed, dtype=bool)
+    cutoffs = np.unique(stage1_scores)
+
+    high = float("inf")
+    for cutoff in cutoffs[::-1]:
+        accepted = stage1_scores >= cutoff
+        if full_entailed[accepted].mean() < target_agreement:
+            break
+        high = float(cutoff)
+
+    low = float("-inf")
+    for cutoff in cutoffs:
+        rejected = stage1_scores < cutoff
+        if rejected.any() and (~full_entailed[rejected]).mean() < target_agreement:
+            break
+        low = float(cutoff)
+
+    return min(low, high), high
+
+
+def cascade_entailment_scores(
+    pairs,
+    similarity,
+    batch_size: int = NLI_BATCH_SIZE,
+    measure_agreement: bool = False,
+):
+    """
+    Two-stage scoring: a cheap first stage settles clear cases, only the
+    pairs inside the uncertainty band go to the NLI model.
+
+    Stage 1 is CASCADE_CHEAP_MODEL's entailment probability when set,
+    otherwise the embedding similarity, compared against
+    [CASCADE_LOW, CASCADE_HIGH). Accepted pairs score at least
+    NLI_THRESHOLD, rejected pairs score 0; those values decide coverage
+    only, stats["nli_scored"] marks the pairs with a real NLI score.
+
+    Returns (entailment, stats). With measure_agreement=True every pair
+    is also scored by the full NLI model to report the agreement rate
+    and a calibrated band.
+    """
+    import numpy as np
+    from scipy.special import softmax
+
+    similarity = np.asarray(similarity, dtype=np.float32)
+
+    if CASCADE_CHEAP_MODEL:
+        if pairs:
+            cheap_logits = get_cross_encoder(CASCADE_CHEAP_MODEL).predict(
+                pairs,
+                batch_size=batch_size,
+                convert_to_numpy=True
+            )
+            stage1 = softmax(cheap_logits, axis=1)[:, 2].astype(np.float32)
+        else:
+            stage1 = np.zeros(0, dtype=np.float32)
+    else:
+        stage1 = similarity
+
+    accept = stage1 >= CASCADE_HIGH
+    reject = stage1 < CASCADE_LOW
+    uncertain = ~(accept | reject)
+
+    entailment = np.zeros(len(pairs), dtype=np.float32)
+    entailment[accept] = np.maximum(stage1[accept], NLI_THRESHOLD)
+
+    escalated = np.flatnonzero(uncertain)
+    if len(escalated):
+        entailment[escalated] = nli_entailment_scores(
+            [pairs[k] for k in escalated], batch_size=batch_size
+        )
+
+    stats = {
+        "stage1": "cheap cross-encoder" if CASCADE_CHEAP_MODEL else "similarity",
+        "pairs": len(pairs),
+        "stage1_accepted": int(accept.sum()),
+        "stage1_rejected": int(reject.sum()),
+        "escalated": int(len(escalated)),
+        "nli_scored": uncertain,
+    }
+
+    if measure_agreement and pairs:
+        full = nli_entailment_scores(pairs, batch_size=batch_size) >= NLI_THRESHOLD
+        stats["agreement"] = float(((entailment >= NLI_THRESHOLD) == full).mean())
+        stats["suggested_band"] = calibrate_cascade_band(stage1, full)
+
+    return entailment, stats
+
+
+def print_cascade_stats(stats):
+    print("\n---------- CASCADE ----------")
+    print(f"Stage 1 ({stats['stage1']}): "
+          f"{stats['stage1_accepted']} accepted, {stats['stage1_rejected']} rejected "
+          f"of {stats['pairs']} pairs")
+    print(f"Stage 2 (NLI): {stats['escalated']} escalated")
+    if "agreement" in stats:
+        low, high = stats["suggested_band"]
+        print(f"Agreement with full NLI: {round(stats['agreement'] * 100, 2)}%")
+        print(f"Suggested band: CASCADE_LOW={low:.3f}, CASCADE_HIGH={high:.3f}")
+
+
+# ================================
+# Coverage-only Scoring (early exit)
+# ================================
+def coverage_only_scores(
+    req_texts,
+    testcases,
+    req_idx,
+    tc_idx,
+    similarity,
+    batch_size: int = NLI_BATCH_SIZE,
+    probe_size: int = COVERAGE_PROBE_SIZE,
+):
+    """
+    Score candidates in descending similarity per requirement and stop
+    at the first entailment >= NLI_THRESHOLD.
+
+    Works in rounds: every unresolved requirement contributes its next
+    `probe_size` candidates, and each round is one batched NLI call.
+    Returns the scored (req_idx, tc_idx, entailment) subset.
+    """
+    import numpy as np
+
+    order = np.lexsort((-np.asarray(similarity), req_idx))
+    req_idx, tc_idx = np.asarray(req_idx)[order], np.asarray(tc_idx)[order]
+
+    # Per requirement: its candidate tc indices, best first
+    queues = {}
+    for i, j in zip(req_idx.tolist(), tc_idx.tolist()):
+        queues.setdefault(i, []).append(j)
+
+    scored_req, scored_tc, scored = [], [], []
+    pending = dict.fromkeys(queues, 0)
+
+    while pending:
+        batch = []
+        for i, pos in pending.items():
+            batch.extend((i, j) for j in queues[i][pos:pos + probe_size])
+
+        entailment = nli_entailment_scores(
+            [(testcases[j], req_texts[i]) for i, j in batch],
+            batch_size=batch_size
+        )
+
+        resolved = set()
+        for (i, j), score in zip(batch, entailment):
+            scored_req.append(i)
+            scored_tc.append(j)
+            scored.append(score)
+            if score >= NLI_THRESHOLD:
+                resolved.add(i)
+
+        pending = {
+            i: pos + probe_size
+            for i, pos in pending.items()
+            if i not in resolved and pos + probe_size < len(queues[i])
+        }
+
+    return (
+        np.asarray(scored_req, dtype=np.int64),
+        np.asarray(scored_tc, dtype=np.int64),
+        np.asarray(scored, dtype=np.float32),
     )
 
-    sim_matrix = cosine_similarity(req_emb, tc_emb)
 
-    coverage = {}
-    missing = []
+# ================================
+# Result Assembly
+# ================================
+def summarize_validation(requirements, testcases, req_idx, tc_idx, entailment, accuracy_mask=None):
+    """
+    Turn scored candidate pairs into (coverage, missing, completeness, accuracy).
+
+    req_idx / tc_idx / entailment are aligned, in requirement-major order.
+    With `accuracy_mask`, only pairs where it is True count towards accuracy
+    (e.g. the pairs the NLI model actually scored).
+    """
+    import numpy as np
+
+    matches_by_req = {}
     accuracy_scores = []
 
-    print("Validating coverage...")
-    for i, req in enumerate(requirements):
-        semantic_candidates = []
+    if accuracy_mask is None:
+        accuracy_mask = np.ones(len(entailment), dtype=bool)
 
-        # -------- Semantic filtering --------
-        for j, tc in enumerate(testcases):
-            if sim_matrix[i][j] >= SEMANTIC_THRESHOLD:
-                semantic_candidates.append(tc)
-
-        matches = []
-
-        # -------- NLI validation --------
-        for tc in semantic_candidates:
-            logits = nli_model.predict([(tc, req["text"])])[0]
-            probs = softmax(logits)
-
-            entailment_score = float(probs[2])  # entailment
-            if entailment_score >= NLI_THRESHOLD:
-                matches.append({
-                    "testcase": tc,
-                    "entailment_score": round(entailment_score, 3)
-                })
+    for i, j, score, counts in zip(req_idx, tc_idx, entailment, accuracy_mask):
+        entailment_score = float(score)
+        if entailment_score >= NLI_THRESHOLD:
+            matches_by_req.setdefault(int(i), []).append({
+                "testcase": testcases[j],
+                "entailment_score": round(entailment_score, 3)
+            })
+            if counts:
                 accuracy_scores.append(entailment_score)
 
+    coverage = {}
+    missing = []
+
+    for i, req in enumerate(requirements):
+        matches = matches_by_req.get(i)
         if matches:
             coverage[req["text"]] = {
                 "category": req["category"],
@@ -132,18 +371,164 @@ def validate_testcases(
     completeness = (covered / total) * 100 if total else 0
     accuracy = (np.mean(accuracy_scores) * 100) if accuracy_scores else 0
 
+    return coverage, missing, completeness, accuracy
+
+
+def print_validation_result(total, coverage, missing, completeness, accuracy, accuracy_note=""):
     print("\n========== VALIDATION RESULT ==========")
     print(f"Total Requirements: {total}")
-    print(f"Covered Requirements: {covered}")
+    print(f"Covered Requirements: {len(coverage)}")
     print(f"Missing Requirements: {len(missing)}")
     print(f"Completeness Percentage: {round(completeness, 2)}%")
-    print(f"Accuracy Percentage: {round(accuracy, 2)}%")
+    print(f"Accuracy Percentage: {round(accuracy, 2)}%{accuracy_note}")
 
     if missing:
         print("\nMissing Requirements:")
         for req in missing:
             print(f"- {req['requirement']} (Category: {req['category']})")
 
+
+# ================================
+# Core Validator (PUBLIC API)
+# ================================
+def validate_testcases(
+    requirement_file: Path,
+    testcase_file: Path,
+    nli_batch_size: int = NLI_BATCH_SIZE,
+    retrieval_mode: str = RETRIEVAL_MODE,
+    coverage_only: bool = COVERAGE_ONLY,
+    cascade: bool = CASCADE_ENABLED,
+    measure_cascade_agreement: bool = False,
+    bm25_prefilter: bool = BM25_PREFILTER,
+    bm25_top_n: int = BM25_TOP_N,
+    service_url: str | None = VALIDATOR_SERVICE_URL,
+):
+    """
+    coverage_only=True stops scoring a requirement at its first entailed
+    candidate: completeness and missing are unchanged, accuracy is only
+    sampled from those first matches.
+
+    cascade=True lets a cheap first stage settle clear pairs and only
+    escalates the uncertainty band to the NLI model.
+
+    bm25_prefilter=True shortlists the `bm25_top_n` lexically closest
+    testcases per requirement; only those are embedded and scored.
+
+    service_url sends the job to a warm validator service (see
+    validator.service) instead of loading models in this process. The
+    service honours retrieval_mode and nli_batch_size; coverage-only,
+    cascade and BM25 runs are validated locally instead.
+    """
+    if service_url and (coverage_only or cascade or bm25_prefilter):
+        print("Warning: the validator service does not support coverage-only, cascade "
+              "or BM25 validation. Validating locally.")
+        service_url = None
+
+    if service_url:
+        from validator.service import ServiceUnavailable, request_validation
+
+        try:
+            response = request_validation(
+                requirement_file, testcase_file, service_url,
+                options={"retrieval_mode": retrieval_mode, "nli_batch_size": nli_batch_size},
+            )
+        except ServiceUnavailable as e:
+            print(f"Warning: validator service unavailable ({e}). Validating locally.")
+        else:
+            result = (
+                response["coverage"],
+                response["missing"],
+                response["completeness"],
+                response["accuracy"],
+            )
+            print_validation_result(response["total"], *result)
+            return result
+
+    # Heavy numeric imports are deferred so importing the validator is cheap
+    from embedding_cache import embed_texts
+    from validator.retrieval import find_candidates
+
+    print("Loading requirements...")
+    requirements = load_requirements(requirement_file)
+    req_texts = [r["text"] for r in requirements]
+
+    print("Loading test cases...")
+    testcases = load_testcases(testcase_file)
+
+    if not requirements or not testcases:
+        raise ValueError("Empty requirements or test cases provided.")
+
+    if bm25_prefilter:
+        from validator.bm25 import bm25_shortlists
+        from validator.retrieval import shortlist_candidates
+
+        # -------- Lexical prefilter --------
+        print("Shortlisting test cases with BM25...")
+        shortlists = bm25_shortlists(req_texts, testcases, top_n=bm25_top_n)
+        kept = sorted({j for rows in shortlists for j in rows})
+        row_of = {j: row for row, j in enumerate(kept)}
+        print(f"BM25 kept {len(kept)} of {len(testcases)} test cases")
+
+        print("Generating embeddings...")
+        req_emb = embed_texts(req_texts, EMBEDDING_MODEL)
+        tc_emb = embed_texts([testcases[j] for j in kept], EMBEDDING_MODEL)
+
+        print("Validating coverage...")
+
+        # -------- Semantic filtering --------
+        req_idx, rows, similarity = shortlist_candidates(
+            req_emb, tc_emb, [[row_of[j] for j in sl] for sl in shortlists],
+            SEMANTIC_THRESHOLD
+        )
+        tc_idx = [kept[row] for row in rows]
+    else:
+        print("Generating embeddings...")
+        req_emb = embed_texts(req_texts, EMBEDDING_MODEL)
+        tc_emb = embed_texts(testcases, EMBEDDING_MODEL)
+
+        print("Validating coverage...")
+
+        # -------- Semantic filtering --------
+        req_idx, tc_idx, similarity = find_candidates(
+            req_emb, tc_emb, SEMANTIC_THRESHOLD, mode=retrieval_mode
+        )
+
+    # -------- NLI validation --------
+    if coverage_only:
+        req_idx, tc_idx, entailment = coverage_only_scores(
+            req_texts, testcases, req_idx, tc_idx, similarity,
+            batch_size=nli_batch_size
+        )
+    elif cascade:
+        pairs = [(testcases[j], req_texts[i]) for i, j in zip(req_idx, tc_idx)]
+        entailment, cascade_stats = cascade_entailment_scores(
+            pairs, similarity,
+            batch_size=nli_batch_size,
+            measure_agreement=measure_cascade_agreement
+        )
+        print_cascade_stats(cascade_stats)
+    else:
+        pairs = [(testcases[j], req_texts[i]) for i, j in zip(req_idx, tc_idx)]
+        entailment = nli_entailment_scores(pairs, batch_size=nli_batch_size)
+
+    accuracy_mask = None
+    accuracy_note = ""
+    if coverage_only:
+        accuracy_note = " (sampled, coverage-only mode)"
+    elif cascade:
+        # Stage-1 accepted pairs carry no NLI probability
+        accuracy_mask = cascade_stats["nli_scored"]
+        accuracy_note = " (NLI-escalated pairs only, cascade mode)"
+
+    coverage, missing, completeness, accuracy = summarize_validation(
+        requirements, testcases, req_idx, tc_idx, entailment, accuracy_mask
+    )
+
+    print_validation_result(
+        len(requirements), coverage, missing, completeness, accuracy,
+        accuracy_note=accuracy_note
+    )
+
     # FEEDBACK LOOP (ONLY IN INTEGRATED MODE)
     # if (
     #     MODE == "INTEGRATED"
@@ -181,5 +566,95 @@ def validate_testcases(
     return coverage, missing, completeness, accuracy 
 
 
+# ================================
+# Incremental Validator (PUBLIC API)
+# ================================
+def incremental_supported(
+    service_url: str | None = VALIDATOR_SERVICE_URL,
+    coverage_only: bool = COVERAGE_ONLY,
+    cascade: bool = CASCADE_ENABLED,
+    bm25_prefilter: bool = BM25_PREFILTER,
+):
+    """Whether validate_incremental scores the way validate_testcases does with these options."""
+    return not (service_url or coverage_only or cascade or bm25_prefilter)
+
+
+def validate_incremental(
+    previous_result,
+    new_testcases,
+    missing_requirements=None,
+    nli_batch_size: int = NLI_BATCH_SIZE,
+    retrieval_mode: str = RETRIEVAL_MODE,
+):
+    """
+    Update a previous (coverage, missing, completeness, accuracy) result
+    with newly generated testcases.
+
+    Only the still-missing requirements (default: previous missing) are
+    checked, and only against `new_testcases`, so a feedback iteration
+    costs O(missing x new). Requirements that were already covered are
+    not re-scored, so their matches against the new testcases do not
+    count towards accuracy.
+
+    Scoring is always local, full NLI on retrieval candidates: the
+    validator service, coverage-only, cascade and BM25 options are not
+    supported. Callers should use validate_testcases when any of them is
+    enabled (see incremental_supported).
+    """
+    import numpy as np
+    from embedding_cache import embed_texts
+    from validator.retrieval import find_candidates
+
+    prev_coverage, prev_missing, _, prev_accuracy = previous_result
+    if missing_requirements is None:
+        missing_requirements = prev_missing
+
+    requirements = [
+        {"text": m["requirement"], "category": m["category"]}
+        for m in missing_requirements
+    ]
+    testcases = [tc.strip() for tc in new_testcases if tc.strip()]
+
+    coverage = dict(prev_coverage)
+    new_scores = []
+
+    if requirements and testcases:
+        print(f"Incremental validation: {len(requirements)} missing requirements "
+              f"x {len(testcases)} new test cases...")
+        req_texts = [r["text"] for r in requirements]
+
+        req_emb = embed_texts(req_texts, EMBEDDING_MODEL)
+        tc_emb = embed_texts(testcases, EMBEDDING_MODEL)
+
+        req_idx, tc_idx, _ = find_candidates(
+            req_emb, tc_emb, SEMANTIC_THRESHOLD, mode=retrieval_mode
+        )
+        pairs = [(testcases[j], req_texts[i]) for i, j in zip(req_idx, tc_idx)]
+        entailment = nli_entailment_scores(pairs, batch_size=nli_batch_size)
+
+        new_coverage, _, _, _ = summarize_validation(
+            requirements, testcases, req_idx, tc_idx, entailment
+        )
+        coverage.update(new_coverage)
+        new_scores = [float(e) for e in entailment if float(e) >= NLI_THRESHOLD]
+
+    missing = [m for m in prev_missing if m["requirement"] not in coverage]
+
+    total = len(prev_coverage) + len(prev_missing)
+    completeness = (len(coverage) / total) * 100 if total else 0
+
+    # Running mean over previous matches plus the new ones
+    prev_count = sum(len(c["matches"]) for c in prev_coverage.values())
+    count = prev_count + len(new_scores)
+    accuracy = (
+        ((prev_accuracy / 100) * prev_count + sum(new_scores)) / count * 100
+        if count else 0
+    )
+
+    print_validation_result(total, coverage, missing, completeness, accuracy)
+
+    return coverage, missing, completeness, accuracy
+
+
 
 